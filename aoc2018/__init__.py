@@ -0,0 +1,4 @@
+"""
+Advent of Code 2018
+Shared tooling for running the daily solutions.
+"""
@@ -0,0 +1,6 @@
+"""Entry point for `python -m aoc2018`."""
+
+from aoc2018.cli import main
+
+if __name__ == "__main__":
+    main()
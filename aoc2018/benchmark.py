@@ -0,0 +1,463 @@
+"""
+Benchmark suite for the public functions of every day and the shared parser.
+
+Each benchmark generates a synthetic input of a given size, prepares the
+arguments of the function under test outside of the timed region, then
+measures the function's wall time and peak memory.
+"""
+
+import json
+import platform
+import tempfile
+import tracemalloc
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from os import makedirs, path, remove
+from time import perf_counter
+from types import ModuleType
+from typing import Any, NamedTuple
+
+from aoc2018.days import get_day, get_parsing, import_day_module
+from aoc2018.generators import (
+    generate_box_ids,
+    generate_claims,
+    generate_frequencies,
+    generate_guard_records,
+    generate_instructions,
+    generate_license,
+    generate_polymer,
+    generate_serial_numbers,
+    generate_star_field,
+)
+
+BENCHMARK_CONVERGENCE_TIME = 50
+
+# NOTE: Solvers are benchmarked on the output of the day module's own parser,
+# which is the input they are written against.
+DAY_PARSERS = {
+    1: "read_frequencies",
+    2: "read_box_ids",
+    3: "read_claims",
+    4: "read_records",
+    5: "read_polymer",
+    7: "read_instructions",
+    8: "read_license",
+    10: "read_point_data",
+}
+
+Preparer = Callable[[ModuleType, str], Any]
+Target = Callable[[ModuleType, Any], Any]
+
+
+class Benchmark(NamedTuple):
+    """A solver function measured on synthetic inputs of several sizes."""
+
+    name: str
+    day_number: int
+    generate: Callable[[int, int], str]
+    prepare: Preparer
+    run: Target
+    sizes: tuple[int, ...]
+
+
+class BenchmarkResult(NamedTuple):
+    """The measurements of one benchmark at one input size."""
+
+    name: str
+    day_number: int
+    size: int
+    seconds: float | None
+    throughput: float | None
+    peak_memory_bytes: int | None
+    error: str | None
+
+
+def parse_input(module: ModuleType, file_path: str, day_number: int) -> Any:
+    """Parse a generated input with the day module's own read function."""
+
+    return getattr(module, DAY_PARSERS[day_number])(file_path)
+
+
+def read_path(module: ModuleType, file_path: str) -> str:
+    """Pass the input path through so that the parser itself is measured."""
+
+    return file_path
+
+
+def parser_benchmark(
+    name: str,
+    day_number: int,
+    generate: Callable[[int, int], str],
+    sizes: tuple[int, ...],
+) -> Benchmark:
+    """Create a benchmark of a day module's own input parser."""
+
+    return Benchmark(
+        name,
+        day_number,
+        generate,
+        read_path,
+        lambda day, file_path: getattr(day, name)(file_path),
+        sizes,
+    )
+
+
+def shared_parser_benchmark(
+    name: str,
+    day_number: int,
+    generate: Callable[[int, int], str],
+    sizes: tuple[int, ...],
+) -> Benchmark:
+    """Create a benchmark of the shared bulk parser used by the runner."""
+
+    return Benchmark(
+        f"parsing.{name}",
+        day_number,
+        generate,
+        read_path,
+        lambda day, file_path: getattr(get_parsing(), name)(file_path),
+        sizes,
+    )
+
+
+def solver_benchmark(
+    name: str,
+    day_number: int,
+    generate: Callable[[int, int], str],
+    run: Target,
+    sizes: tuple[int, ...],
+) -> Benchmark:
+    """Create a benchmark of a solver function applied to a parsed input."""
+
+    return Benchmark(
+        name,
+        day_number,
+        generate,
+        lambda day, file_path: parse_input(day, file_path, day_number),
+        run,
+        sizes,
+    )
+
+
+def generate_benchmark_star_field(size: int, seed: int) -> str:
+    """Generate a star field that converges quickly enough to step through."""
+
+    return generate_star_field(size, seed, BENCHMARK_CONVERGENCE_TIME)
+
+
+def generate_grid_specification(size: int, seed: int) -> str:
+    """Generate a serial number along with a grid side length of the given size."""
+
+    return f"{generate_serial_numbers(1, seed).strip()} {size}\n"
+
+
+def read_grid_specification(file_path: str) -> tuple[int, int]:
+    """Read a serial number and grid side length."""
+
+    with open(file_path, encoding="utf-8") as file:
+        serial_number, side_length = file.read().split()
+
+    return int(serial_number), int(side_length)
+
+
+def prepare_power_grid(day: ModuleType, file_path: str) -> Any:
+    """Compute the square power grid described by a grid specification."""
+
+    serial_number, side_length = read_grid_specification(file_path)
+
+    return day.compute_power_grid_array(serial_number, side_length, side_length)
+
+
+def read_serial_numbers(file_path: str) -> list[int]:
+    """Read serial numbers, one per line."""
+
+    with open(file_path, encoding="utf-8") as file:
+        return [int(line) for line in file]
+
+
+BENCHMARKS = [
+    parser_benchmark("read_frequencies", 1, generate_frequencies, (10**3, 10**5)),
+    shared_parser_benchmark(
+        "read_frequencies", 1, generate_frequencies, (10**3, 10**5)
+    ),
+    solver_benchmark(
+        "get_final_frequency",
+        1,
+        generate_frequencies,
+        lambda day, frequencies: day.get_final_frequency(frequencies),
+        (10**3, 10**5),
+    ),
+    solver_benchmark(
+        "find_first_repeat_frequency",
+        1,
+        generate_frequencies,
+        lambda day, frequencies: day.find_first_repeat_frequency(frequencies),
+        (10**3, 10**5),
+    ),
+    parser_benchmark("read_box_ids", 2, generate_box_ids, (10**3, 10**5)),
+    solver_benchmark(
+        "checksum",
+        2,
+        generate_box_ids,
+        lambda day, box_ids: day.checksum(box_ids),
+        (10**3, 10**5),
+    ),
+    solver_benchmark(
+        "find_correct_box_ids",
+        2,
+        generate_box_ids,
+        lambda day, box_ids: day.find_correct_box_ids(box_ids),
+        (10**3, 10**5),
+    ),
+    parser_benchmark("read_claims", 3, generate_claims, (10**3, 10**4)),
+    shared_parser_benchmark("read_claims", 3, generate_claims, (10**3, 10**4)),
+    solver_benchmark(
+        "count_position_overlap",
+        3,
+        generate_claims,
+        lambda day, claims: day.count_position_overlap(claims),
+        (10**3, 10**4),
+    ),
+    solver_benchmark(
+        "find_non_overlapping_claim",
+        3,
+        generate_claims,
+        lambda day, claims: day.find_non_overlapping_claim(claims),
+        (10**3, 10**4),
+    ),
+    Benchmark(
+        "read_claim_array",
+        3,
+        generate_claims,
+        read_path,
+        lambda day, file_path: day.read_claim_array(file_path),
+        (10**3, 10**4),
+    ),
+    Benchmark(
+        "count_overlapping_square_inches_vectorized",
+        3,
+        generate_claims,
+        lambda day, file_path: day.read_claim_array(file_path),
+        lambda day, claims: day.count_overlapping_square_inches_vectorized(claims),
+        (10**3, 10**4),
+    ),
+    Benchmark(
+        "find_non_overlapping_claim_vectorized",
+        3,
+        generate_claims,
+        lambda day, file_path: day.read_claim_array(file_path),
+        lambda day, claims: day.find_non_overlapping_claim_vectorized(claims),
+        (10**3, 10**4),
+    ),
+    parser_benchmark("read_records", 4, generate_guard_records, (10**3, 10**4)),
+    shared_parser_benchmark("read_records", 4, generate_guard_records, (10**3, 10**4)),
+    parser_benchmark("read_polymer", 5, generate_polymer, (10**4, 10**6)),
+    solver_benchmark(
+        "reduce_polymer",
+        5,
+        generate_polymer,
+        lambda day, polymer: day.reduce_polymer(polymer),
+        (10**4, 10**6),
+    ),
+    solver_benchmark(
+        "find_smallest_polymer_after_unit_removal",
+        5,
+        generate_polymer,
+        lambda day, polymer: day.find_smallest_polymer_after_unit_removal(polymer),
+        (10**4, 10**5),
+    ),
+    parser_benchmark("read_instructions", 7, generate_instructions, (50, 325)),
+    shared_parser_benchmark("read_instructions", 7, generate_instructions, (50, 325)),
+    solver_benchmark(
+        "find_completion_order",
+        7,
+        generate_instructions,
+        lambda day, instructions: day.find_completion_order(instructions),
+        (50, 325),
+    ),
+    solver_benchmark(
+        "get_total_completion_time",
+        7,
+        generate_instructions,
+        lambda day, instructions: day.get_total_completion_time(instructions),
+        (50, 325),
+    ),
+    parser_benchmark("read_license", 8, generate_license, (10**3, 10**5)),
+    shared_parser_benchmark("read_license", 8, generate_license, (10**3, 10**5)),
+    solver_benchmark(
+        "create_license_tree",
+        8,
+        generate_license,
+        lambda day, license_data: day.create_license_tree(license_data),
+        (10**3, 10**4),
+    ),
+    parser_benchmark("read_point_data", 10, generate_star_field, (10**3, 10**5)),
+    shared_parser_benchmark("read_point_data", 10, generate_star_field, (10**3, 10**5)),
+    solver_benchmark(
+        "get_grid_and_time_for_message",
+        10,
+        generate_benchmark_star_field,
+        lambda day, points: day.get_grid_and_time_for_message(points),
+        (10**3, 10**4),
+    ),
+    solver_benchmark(
+        "find_message_time",
+        10,
+        generate_star_field,
+        lambda day, points: day.find_message_time(day.create_point_arrays(points)),
+        (10**3, 10**5),
+    ),
+    Benchmark(
+        "compute_power_grid_array",
+        11,
+        generate_grid_specification,
+        lambda day, file_path: read_grid_specification(file_path),
+        lambda day, specification: day.compute_power_grid_array(
+            specification[0],
+            specification[1],
+            specification[1],
+        ),
+        (300, 3000),
+    ),
+    Benchmark(
+        "find_largest_power_subgrid",
+        11,
+        generate_grid_specification,
+        prepare_power_grid,
+        lambda day, grid: day.find_largest_power_subgrid(grid),
+        (100, 300),
+    ),
+    Benchmark(
+        "find_largest_power_subgrids_for_serial_numbers",
+        11,
+        generate_serial_numbers,
+        lambda day, file_path: read_serial_numbers(file_path),
+        lambda day, serial_numbers: day.find_largest_power_subgrids_for_serial_numbers(
+            serial_numbers,
+            range(1, 31),
+        ),
+        (10, 100),
+    ),
+]
+
+
+def measure(benchmark: Benchmark, size: int, seed: int = 0) -> BenchmarkResult:
+    """Measure one benchmark at one input size.
+
+    The function is run once for wall time and once more under tracemalloc for
+    peak memory, since tracing allocations slows the function down.
+    """
+
+    try:
+        day = import_day_module(get_day(benchmark.day_number))
+
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            suffix=".txt",
+            delete=False,
+        ) as file:
+            file.write(benchmark.generate(size, seed))
+
+        try:
+            argument = benchmark.prepare(day, file.name)
+
+            start = perf_counter()
+            benchmark.run(day, argument)
+            seconds = perf_counter() - start
+
+            argument = benchmark.prepare(day, file.name)
+
+            tracemalloc.start()
+            try:
+                benchmark.run(day, argument)
+                _, peak_memory_bytes = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        finally:
+            remove(file.name)
+    except Exception as e:  # noqa: BLE001
+        # NOTE: Each benchmark is its own boundary, so any failure is recorded
+        # in its result rather than aborting the rest of the suite.
+        error = f"{type(e).__name__}: {e}"
+        return BenchmarkResult(
+            benchmark.name,
+            benchmark.day_number,
+            size,
+            None,
+            None,
+            None,
+            error,
+        )
+
+    return BenchmarkResult(
+        benchmark.name,
+        benchmark.day_number,
+        size,
+        seconds,
+        size / seconds if seconds > 0 else None,
+        peak_memory_bytes,
+        None,
+    )
+
+
+def run_benchmarks(
+    day_numbers: Iterable[int] | None = None,
+    scale: float = 1.0,
+    seed: int = 0,
+) -> list[BenchmarkResult]:
+    """Run the benchmarks of the given days, or of every day."""
+
+    if day_numbers is not None:
+        day_numbers = set(day_numbers)
+
+    results = []
+
+    for benchmark in BENCHMARKS:
+        if day_numbers is not None and benchmark.day_number not in day_numbers:
+            continue
+
+        for size in benchmark.sizes:
+            scaled_size = max(1, round(size * scale))
+            results.append(measure(benchmark, scaled_size, seed))
+
+    return results
+
+
+def write_results(results: list[BenchmarkResult], file_path: str) -> None:
+    """Write benchmark results and their environment to a JSON file."""
+
+    report = {
+        "created": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [result._asdict() for result in results],
+    }
+
+    directory = path.dirname(file_path)
+    if directory:
+        makedirs(directory, exist_ok=True)
+
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+
+def format_results(results: list[BenchmarkResult]) -> str:
+    """Format benchmark results as a table for display."""
+
+    lines = []
+
+    for result in results:
+        label = f"day {result.day_number:>2}  {result.name:<48}{result.size:>9}"
+
+        if result.error is not None:
+            lines.append(f"{label}  {result.error}")
+            continue
+
+        lines.append(
+            f"{label}  {result.seconds * 1000:>11.3f} ms"
+            f"  {result.throughput:>14.1f}/s"
+            f"  {result.peak_memory_bytes / 1024:>11.1f} KiB",
+        )
+
+    return "\n".join(lines)
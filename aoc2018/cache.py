@@ -0,0 +1,302 @@
+"""
+Content-addressed cache of parsed inputs and computed answers.
+
+Entries are keyed by the SHA-256 digest of the input file together with the
+version of the code that produced them, which is a digest of the day's module,
+of the registry that adapts it and of every module the registry depends on.
+Editing either the input or the code therefore misses the cache instead of
+returning stale results.
+
+Parsed inputs are stored as NumPy arrays in .npz files, and answers as JSON.
+Files are written under temporary names and renamed into place, so processes
+sharing a cache never read a partly written entry. An entry that another
+process evicts while it is being read, or that cannot be decoded, counts as a
+miss. The cache is bounded in size, evicting the least recently used files
+first.
+"""
+
+import hashlib
+import json
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from importlib.util import find_spec
+from os import environ, listdir, makedirs, path, remove, replace, stat, utime
+from tempfile import NamedTemporaryFile
+from types import ModuleType
+from typing import IO, Any, NamedTuple
+from zipfile import BadZipFile
+
+import numpy as np
+
+from aoc2018 import days
+
+CACHE_FORMAT_VERSION = "2"
+CACHE_DIR_VARIABLE = "AOC2018_CACHE_DIR"
+DEFAULT_CACHE_DIR = path.join(path.expanduser("~"), ".cache", "aoc2018")
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+PARSED_SUFFIX = ".npz"
+ANSWERS_SUFFIX = ".json"
+PARTIAL_SUFFIX = ".partial"
+
+# NOTE: Entries are never partly written, but one may still be damaged on disk,
+# and is then read as a miss and overwritten rather than failing the run.
+UNREADABLE_ENTRY_ERRORS = (BadZipFile, EOFError, KeyError, ValueError)
+
+Arrays = dict[str, np.ndarray]
+
+
+class Codec(NamedTuple):
+    """Converts a day's parsed input to and from NumPy arrays."""
+
+    encode: Callable[[ModuleType, Any], Arrays]
+    decode: Callable[[ModuleType, Arrays], Any]
+
+
+def compact(values: Any, width: int | None = None) -> np.ndarray:
+    """Store integers in the smallest signed integer type that holds them."""
+
+    array = np.asarray(values, dtype=np.int64)
+    if width is not None:
+        array = array.reshape(-1, width)
+
+    if array.size == 0:
+        return array.astype(np.int8)
+
+    dtype = np.result_type(
+        np.min_scalar_type(int(array.min())),
+        np.min_scalar_type(int(array.max())),
+        np.int8,
+    )
+
+    return array.astype(dtype)
+
+
+CODECS: dict[int, Codec] = {
+    1: Codec(
+        lambda day, frequencies: {"frequencies": compact(frequencies)},
+        lambda day, arrays: arrays["frequencies"].astype(np.int64),
+    ),
+    2: Codec(
+        lambda day, box_ids: {"box_ids": np.array(box_ids, dtype=np.bytes_)},
+        lambda day, arrays: arrays["box_ids"].astype(np.str_).tolist(),
+    ),
+    3: Codec(
+        lambda day, claims: {"claims": claims},
+        lambda day, arrays: arrays["claims"],
+    ),
+    4: Codec(
+        lambda day, records: {"records": compact(records)},
+        lambda day, arrays: arrays["records"].astype(np.int64),
+    ),
+    5: Codec(
+        lambda day, polymer: {
+            "polymer": np.frombuffer(polymer.encode("ascii"), dtype=np.uint8),
+        },
+        lambda day, arrays: arrays["polymer"].tobytes().decode("ascii"),
+    ),
+    7: Codec(
+        lambda day, instructions: {
+            "instructions": np.array(
+                [(ord(step), ord(dependency)) for step, dependency in instructions],
+                dtype=np.uint8,
+            ).reshape(-1, 2),
+        },
+        lambda day, arrays: [
+            day.Instruction(chr(step), chr(dependency))
+            for step, dependency in arrays["instructions"].tolist()
+        ],
+    ),
+    8: Codec(
+        lambda day, license_data: {"license": compact(license_data)},
+        lambda day, arrays: arrays["license"].tolist(),
+    ),
+    10: Codec(
+        lambda day, point_arrays: {"points": compact(np.hstack(point_arrays))},
+        lambda day, arrays: days.create_point_arrays(
+            day,
+            arrays["points"].astype(np.int64),
+        ),
+    ),
+    11: Codec(
+        lambda day, serial_number: {"serial_number": np.array(serial_number)},
+        lambda day, arrays: int(arrays["serial_number"]),
+    ),
+}
+
+
+def hash_file(file_path: str) -> str:
+    """Compute the SHA-256 digest of a file's contents."""
+
+    digest = hashlib.sha256()
+
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def get_solver_version(module: ModuleType) -> str:
+    """Compute a version for a day's solution from the code that produces it."""
+
+    digest = hashlib.sha256(CACHE_FORMAT_VERSION.encode())
+
+    dependency_paths = [
+        find_spec(module_name).origin for module_name in days.REGISTRY_DEPENDENCIES
+    ]
+
+    for file_path in (module.__file__, days.__file__, __file__, *dependency_paths):
+        with open(file_path, "rb") as file:
+            digest.update(file.read())
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """A size-bounded, content-addressed cache of parsed inputs and answers."""
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    ) -> None:
+        if directory is None:
+            directory = environ.get(CACHE_DIR_VARIABLE, DEFAULT_CACHE_DIR)
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def get_key(self, day_number: int, module: ModuleType, input_path: str) -> str:
+        """Compute the cache key for a day's input and code."""
+
+        digest = hashlib.sha256()
+        digest.update(f"day{day_number}".encode())
+        digest.update(hash_file(input_path).encode())
+        digest.update(get_solver_version(module).encode())
+
+        return digest.hexdigest()
+
+    def load_parsed(self, day_number: int, module: ModuleType, key: str) -> Any:
+        """Load a parsed input, or None if it is not cached."""
+
+        if day_number not in CODECS:
+            return None
+
+        file_path = self._get_path(key, PARSED_SUFFIX)
+
+        try:
+            self._touch(file_path)
+
+            with np.load(file_path) as arrays:
+                return CODECS[day_number].decode(module, dict(arrays))
+        except (FileNotFoundError, *UNREADABLE_ENTRY_ERRORS):
+            return None
+
+    def store_parsed(
+        self,
+        day_number: int,
+        module: ModuleType,
+        key: str,
+        data: Any,
+    ) -> None:
+        """Store a parsed input, if the day can be encoded."""
+
+        if day_number not in CODECS:
+            return
+
+        arrays = CODECS[day_number].encode(module, data)
+
+        with self._open_for_writing(key, PARSED_SUFFIX, "wb") as file:
+            np.savez_compressed(file, **arrays)
+
+        self.evict()
+
+    def load_answers(self, key: str) -> dict[int, str]:
+        """Load the cached answers for an entry, by part."""
+
+        file_path = self._get_path(key, ANSWERS_SUFFIX)
+
+        try:
+            self._touch(file_path)
+
+            with open(file_path, encoding="utf-8") as file:
+                return {int(part): answer for part, answer in json.load(file).items()}
+        except (FileNotFoundError, *UNREADABLE_ENTRY_ERRORS):
+            return {}
+
+    def store_answers(self, key: str, answers: dict[int, Any]) -> None:
+        """Store answers for an entry, merged with any already cached."""
+
+        stored_answers = self.load_answers(key)
+        stored_answers.update({part: str(answer) for part, answer in answers.items()})
+
+        with self._open_for_writing(key, ANSWERS_SUFFIX, "w") as file:
+            json.dump(stored_answers, file)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used files until the cache fits its bound.
+
+        Files that another process removes in the meantime are skipped.
+        """
+
+        entries = []
+        for file_name in listdir(self.directory):
+            if not file_name.endswith((PARSED_SUFFIX, ANSWERS_SUFFIX)):
+                continue
+
+            file_path = path.join(self.directory, file_name)
+            try:
+                file_stat = stat(file_path)
+            except FileNotFoundError:
+                continue
+
+            entries.append((file_stat.st_mtime, file_stat.st_size, file_path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+
+        for _, size, file_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+
+            try:
+                remove(file_path)
+            except FileNotFoundError:
+                pass
+
+            total_bytes -= size
+
+    def _get_path(self, key: str, suffix: str) -> str:
+        """Get the path of a cache file."""
+
+        return path.join(self.directory, key + suffix)
+
+    @contextmanager
+    def _open_for_writing(self, key: str, suffix: str, mode: str) -> Iterator[IO]:
+        """Open a temporary file that replaces a cache file once it is written."""
+
+        makedirs(self.directory, exist_ok=True)
+
+        encoding = None if "b" in mode else "utf-8"
+        with NamedTemporaryFile(
+            mode,
+            encoding=encoding,
+            dir=self.directory,
+            suffix=PARTIAL_SUFFIX,
+            delete=False,
+        ) as file:
+            try:
+                yield file
+            except BaseException:
+                file.close()
+                remove(file.name)
+                raise
+
+        replace(file.name, self._get_path(key, suffix))
+
+    def _touch(self, file_path: str) -> None:
+        """Mark a cache file as recently used."""
+
+        utime(file_path)
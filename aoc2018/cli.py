@@ -0,0 +1,240 @@
+"""
+Command-line interface for running the daily solutions.
+
+Each command imports the subsystems it needs only when it runs, so that running
+a single day starts quickly.
+
+Usage:
+    python -m aoc2018 run <day> [--input PATH] [--part 1|2] [--quiet]
+                          [--metrics PATH] [--profile-dir DIR]
+                          [--cache] [--cache-dir DIR]
+    python -m aoc2018 all [--days DAY ...] [--workers N] [--report PATH]
+    python -m aoc2018 serve (--socket PATH | --port PORT) [--workers N]
+                            [--root DIR]
+    python -m aoc2018 query <day> [--input PATH] [--part 1|2]
+                            (--socket PATH | --port PORT)
+    python -m aoc2018 generate <day> <size> [--seed SEED] [--output PATH]
+    python -m aoc2018 bench [--days DAY ...] [--scale SCALE] [--output PATH]
+"""
+
+import argparse
+import sys
+
+from aoc2018.days import DAYS, REPOSITORY_ROOT, get_default_input_path
+from aoc2018.runner import PARTS, format_day_result, run_day
+
+DEFAULT_BENCHMARK_OUTPUT = "bench_output.json"
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the command-line argument parser."""
+
+    parser = argparse.ArgumentParser(prog="aoc2018")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the solution for a day")
+    run_parser.add_argument("day", type=int, choices=sorted(DAYS))
+    run_parser.add_argument("--input", help="path of the puzzle input")
+    run_parser.add_argument("--part", type=int, choices=PARTS)
+    run_parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="only report timings",
+    )
+    run_parser.add_argument(
+        "--metrics",
+        help="write instrumentation metrics, as Prometheus text for .prom files",
+    )
+    run_parser.add_argument(
+        "--profile-dir",
+        help="write a cProfile dump of each phase to this directory",
+    )
+    run_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="reuse parsed inputs and answers from previous runs",
+    )
+    run_parser.add_argument("--cache-dir", help="directory of the cache")
+
+    all_parser = subparsers.add_parser(
+        "all",
+        help="run many days concurrently and report on all of them",
+    )
+    all_parser.add_argument("--days", type=int, nargs="+", choices=sorted(DAYS))
+    all_parser.add_argument("--workers", type=int)
+    all_parser.add_argument("--report", help="write the report as JSON")
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="serve requests with warm solutions",
+    )
+    add_address_arguments(serve_parser)
+    serve_parser.add_argument("--workers", type=int)
+    serve_parser.add_argument(
+        "--root",
+        default=REPOSITORY_ROOT,
+        help="directory that requested input paths must be under",
+    )
+
+    query_parser = subparsers.add_parser(
+        "query",
+        help="send a request to a running service",
+    )
+    query_parser.add_argument("day", type=int, choices=sorted(DAYS))
+    query_parser.add_argument("--input", help="path of the puzzle input")
+    query_parser.add_argument("--part", type=int, choices=PARTS)
+    add_address_arguments(query_parser)
+
+    generate_parser = subparsers.add_parser(
+        "generate",
+        help="generate a synthetic input for a day",
+    )
+    generate_parser.add_argument("day", type=int)
+    generate_parser.add_argument("size", type=int)
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.add_argument("--output", help="defaults to standard output")
+
+    bench_parser = subparsers.add_parser("bench", help="run the benchmark suite")
+    bench_parser.add_argument("--days", type=int, nargs="+")
+    bench_parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiplier applied to every benchmark size",
+    )
+    bench_parser.add_argument("--seed", type=int, default=0)
+    bench_parser.add_argument("--output", default=DEFAULT_BENCHMARK_OUTPUT)
+
+    return parser
+
+
+def add_address_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments that locate a solver service."""
+
+    address = parser.add_mutually_exclusive_group(required=True)
+    address.add_argument("--socket", help="path of a Unix domain socket")
+    address.add_argument("--port", type=int, help="port on localhost")
+
+
+def run_command(args: argparse.Namespace) -> None:
+    """Run the solution for a single day."""
+
+    parts = (args.part,) if args.part else PARTS
+
+    instrumentation = None
+    if args.metrics or args.profile_dir:
+        from aoc2018.instrumentation import Instrumentation
+
+        instrumentation = Instrumentation(profile_dir=args.profile_dir)
+
+    cache = None
+    if args.cache or args.cache_dir:
+        from aoc2018.cache import ResultCache
+
+        cache = ResultCache(args.cache_dir)
+
+    result = run_day(args.day, args.input, parts, instrumentation, cache)
+    print(format_day_result(result, args.quiet))
+
+    if instrumentation is not None and args.metrics:
+        instrumentation.write(args.metrics)
+
+
+def all_command(args: argparse.Namespace) -> None:
+    """Run many days concurrently and report on all of them."""
+
+    from aoc2018.orchestrator import format_report, run_days, write_report
+
+    report = run_days(args.days, args.workers)
+    print(format_report(report))
+
+    if args.report:
+        write_report(report, args.report)
+
+    if report.failures:
+        sys.exit(1)
+
+
+def serve_command(args: argparse.Namespace) -> None:
+    """Serve requests until interrupted."""
+
+    import asyncio
+    import signal
+
+    from aoc2018.service import SolverService
+
+    # NOTE: A terminated service is stopped as if interrupted, so that its
+    # worker processes are shut down rather than left running.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    service = SolverService(args.workers, root=args.root)
+
+    try:
+        asyncio.run(service.serve(args.socket, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+def query_command(args: argparse.Namespace) -> None:
+    """Send a request to a running service and print its response."""
+
+    import json
+
+    from aoc2018.service import send_request
+
+    request = {
+        "day": args.day,
+        "path": args.input or get_default_input_path(args.day),
+        "parts": [args.part] if args.part else list(PARTS),
+    }
+
+    print(json.dumps(send_request(request, args.socket, args.port), indent=2))
+
+
+def generate_command(args: argparse.Namespace) -> None:
+    """Generate a synthetic input for a day."""
+
+    from aoc2018.generators import GENERATORS
+
+    if args.day not in GENERATORS:
+        sys.exit(f"No generator for day {args.day}.")
+
+    text = GENERATORS[args.day](args.size, args.seed)
+
+    if args.output is None:
+        sys.stdout.write(text)
+        return
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+def bench_command(args: argparse.Namespace) -> None:
+    """Run the benchmark suite and write its results."""
+
+    from aoc2018.benchmark import format_results, run_benchmarks, write_results
+
+    results = run_benchmarks(args.days, args.scale, args.seed)
+    print(format_results(results))
+
+    write_results(results, args.output)
+    print(f"Results written to {args.output}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse command-line arguments and run the requested command."""
+
+    args = create_parser().parse_args(argv)
+
+    if args.command == "run":
+        run_command(args)
+    elif args.command == "all":
+        all_command(args)
+    elif args.command == "serve":
+        serve_command(args)
+    elif args.command == "query":
+        query_command(args)
+    elif args.command == "generate":
+        generate_command(args)
+    elif args.command == "bench":
+        bench_command(args)
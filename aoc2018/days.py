@@ -0,0 +1,184 @@
+"""
+Registry of the daily solutions.
+
+Each day is described by how to parse its input and solve each part. Day
+modules are only imported when a day is actually run.
+"""
+
+import sys
+from collections.abc import Callable
+from importlib import import_module
+from os import path
+from types import ModuleType
+from typing import Any, NamedTuple
+
+REPOSITORY_ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+
+DEFAULT_INPUT_FILE = "input.txt"
+
+# NOTE: The shared parser pulls in NumPy, so it is only imported along with a
+# day's module. Modules listed here are part of every cache key.
+PARSING_MODULE = "aoc2018.parsing"
+REGISTRY_DEPENDENCIES = (PARSING_MODULE,)
+
+
+Parser = Callable[[ModuleType, str], Any]
+Solver = Callable[[ModuleType, Any], Any]
+
+
+class Day(NamedTuple):
+    """Describes how to parse the input of a day and solve its parts."""
+
+    module_name: str
+    parse: Parser
+    part_1: Solver | None
+    part_2: Solver | None
+
+
+def get_parsing() -> ModuleType:
+    """Import the shared bulk parser."""
+
+    return import_module(PARSING_MODULE)
+
+
+def parse_claims(day: ModuleType, file_path: str) -> Any:
+    """Parse the claims of day 3 into the day's structured claim array."""
+
+    claims = get_parsing().read_claims(file_path)
+
+    return claims.astype("int32").view(day.CLAIM_DTYPE).reshape(-1)
+
+
+def parse_instructions(day: ModuleType, file_path: str) -> list:
+    """Parse the instructions of day 7, which its solvers need as objects."""
+
+    return [
+        day.Instruction(chr(step), chr(dependency))
+        for step, dependency in get_parsing().read_instructions(file_path).tolist()
+    ]
+
+
+def parse_license(day: ModuleType, file_path: str) -> list[int]:
+    """Parse the license of day 8, which its tree is built from number by number."""
+
+    return get_parsing().read_license(file_path).tolist()
+
+
+def create_point_arrays(day: ModuleType, points: Any) -> Any:
+    """Split rows of position and velocity into the arrays of day 10."""
+
+    return day.PointArrays(points[:, :2].copy(), points[:, 2:].copy())
+
+
+def parse_points(day: ModuleType, file_path: str) -> Any:
+    """Parse the points of light of day 10 straight into position arrays."""
+
+    return create_point_arrays(day, get_parsing().read_point_data(file_path))
+
+
+def render_message(day: ModuleType, point_arrays: Any) -> str:
+    """Render the message formed by the points of light on day 10."""
+
+    message_time = day.find_message_time(point_arrays)
+    message_positions = day.advance_point_arrays(point_arrays, message_time)
+
+    return "\n".join(day.render_positions(message_positions))
+
+
+DAYS: dict[int, Day] = {
+    1: Day(
+        "day1.main",
+        lambda day, file_path: get_parsing().read_frequencies(file_path),
+        lambda day, frequencies: int(frequencies.sum()),
+        lambda day, frequencies: day.find_first_repeat_frequency_incremental(
+            frequencies,
+        ),
+    ),
+    2: Day(
+        "day2.main",
+        lambda day, file_path: day.read_box_ids(file_path),
+        lambda day, box_ids: day.checksum(box_ids),
+        lambda day, box_ids: "".join(
+            day.get_common_letters(*day.find_correct_box_ids(box_ids)),
+        ),
+    ),
+    3: Day(
+        "day3.main",
+        parse_claims,
+        lambda day, claims: day.count_overlapping_square_inches_vectorized(claims),
+        lambda day, claims: int(
+            day.find_non_overlapping_claim_vectorized(claims)["id"]
+        ),
+    ),
+    4: Day(
+        "day4.main",
+        lambda day, file_path: get_parsing().read_records(file_path),
+        None,
+        None,
+    ),
+    5: Day(
+        "day5.main",
+        lambda day, file_path: day.read_polymer(file_path),
+        lambda day, polymer: len(day.reduce_polymer(polymer)),
+        lambda day, polymer: len(day.find_smallest_polymer_after_unit_removal(polymer)),
+    ),
+    7: Day(
+        "day7.main",
+        parse_instructions,
+        lambda day, instructions: "".join(day.find_completion_order(instructions)),
+        lambda day, instructions: day.get_total_completion_time(instructions),
+    ),
+    8: Day(
+        "day8.main",
+        parse_license,
+        lambda day, license_data: day.sum_metadata(
+            day.create_license_tree(license_data),
+        ),
+        lambda day, license_data: day.create_license_tree(license_data).value,
+    ),
+    10: Day(
+        "day10.main",
+        parse_points,
+        render_message,
+        lambda day, point_arrays: day.find_message_time(point_arrays),
+    ),
+    11: Day(
+        "day11.main",
+        lambda day, file_path: day.read_serial_number(file_path),
+        lambda day, serial_number: day.find_largest_power_3_by_3_subgrid(
+            day.create_power_grid(serial_number),
+        ),
+        lambda day, serial_number: day.find_largest_power_subgrid(
+            day.get_power_grid_array(serial_number),
+        ),
+    ),
+}
+
+
+def get_day(day_number: int) -> Day:
+    """Get the registered solution for a day."""
+
+    if day_number not in DAYS:
+        raise ValueError(f"No solution for day {day_number}.")
+
+    return DAYS[day_number]
+
+
+def import_day_module(day: Day) -> ModuleType:
+    """Import the module of a day's solution."""
+
+    if REPOSITORY_ROOT not in sys.path:
+        sys.path.insert(0, REPOSITORY_ROOT)
+
+    # NOTE: The modules the registry parses with are imported here as well, so
+    # that their import is not counted as parsing.
+    for module_name in REGISTRY_DEPENDENCIES:
+        import_module(module_name)
+
+    return import_module(day.module_name)
+
+
+def get_default_input_path(day_number: int) -> str:
+    """Get the path of the puzzle input shipped with a day."""
+
+    return path.join(REPOSITORY_ROOT, f"day{day_number}", DEFAULT_INPUT_FILE)
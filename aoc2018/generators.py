@@ -0,0 +1,229 @@
+"""
+Seeded generators for synthetic puzzle inputs of any size.
+
+Each generator returns the text of an input file in the same format as the
+day's puzzle input, and always produces the same text for the same seed.
+"""
+
+import random
+import string
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+FABRIC_SIDE_LENGTH = 1000
+MAX_CLAIM_SIDE_LENGTH = 30
+
+MESSAGE_WIDTH = 60
+MESSAGE_HEIGHT = 10
+MAX_STAR_SPEED = 5
+DEFAULT_CONVERGENCE_TIME = 10000
+
+MAX_METADATA_COUNT = 5
+MAX_SERIAL_NUMBER = 10000
+
+Generator = Callable[..., str]
+
+
+def generate_frequencies(size: int, seed: int = 0) -> str:
+    """Generate frequency changes that sum to zero so that a repeat exists."""
+
+    rng = random.Random(seed)
+
+    changes = [rng.choice([-1, 1]) * rng.randint(1, 100000) for _ in range(size - 1)]
+    changes.append(-sum(changes))
+
+    return "".join(f"{change:+d}\n" for change in changes)
+
+
+def generate_box_ids(size: int, seed: int = 0, length: int = 26) -> str:
+    """Generate box IDs with one pair that differs by a single character."""
+
+    rng = random.Random(seed)
+
+    box_ids = [
+        "".join(rng.choices(string.ascii_lowercase, k=length))
+        for _ in range(max(size - 1, 1))
+    ]
+
+    # NOTE: The correct pair differs in its last character so that the pair is
+    # adjacent once the IDs are sorted.
+    original = box_ids[rng.randrange(len(box_ids))]
+    replacement = rng.choice(string.ascii_lowercase.replace(original[-1], ""))
+    box_ids.append(original[:-1] + replacement)
+    rng.shuffle(box_ids)
+
+    return "".join(f"{box_id}\n" for box_id in box_ids)
+
+
+def generate_claims(size: int, seed: int = 0) -> str:
+    """Generate fabric claims with exactly one claim that overlaps no other."""
+
+    rng = random.Random(seed)
+
+    isolated_x = FABRIC_SIDE_LENGTH - MAX_CLAIM_SIDE_LENGTH
+    isolated_claim_id = rng.randint(1, size)
+
+    lines = []
+    for claim_id in range(1, size + 1):
+        if claim_id == isolated_claim_id:
+            x, y = isolated_x, rng.randrange(FABRIC_SIDE_LENGTH - MAX_CLAIM_SIDE_LENGTH)
+        else:
+            x = rng.randrange(isolated_x - MAX_CLAIM_SIDE_LENGTH)
+            y = rng.randrange(FABRIC_SIDE_LENGTH - MAX_CLAIM_SIDE_LENGTH)
+
+        width = rng.randint(1, MAX_CLAIM_SIDE_LENGTH)
+        height = rng.randint(1, MAX_CLAIM_SIDE_LENGTH)
+        lines.append(f"#{claim_id} @ {x},{y}: {width}x{height}\n")
+
+    return "".join(lines)
+
+
+def generate_guard_records(size: int, seed: int = 0, guard_count: int = 20) -> str:
+    """Generate an unsorted log of guard shifts, one shift per unit of size."""
+
+    rng = random.Random(seed)
+
+    guard_ids = rng.sample(range(1, 4000), guard_count)
+    shift_date = datetime(1518, 1, 1)
+
+    lines = []
+    for _ in range(size):
+        start = shift_date - timedelta(minutes=rng.randint(0, 15))
+        lines.append(
+            f"[{start:%Y-%m-%d %H:%M}] Guard #{rng.choice(guard_ids)} begins shift\n",
+        )
+
+        minutes = sorted(rng.sample(range(60), 2 * rng.randint(0, 3)))
+        for sleep_minute, wake_minute in zip(minutes[::2], minutes[1::2]):
+            sleep = shift_date + timedelta(minutes=sleep_minute)
+            wake = shift_date + timedelta(minutes=wake_minute)
+            lines.append(f"[{sleep:%Y-%m-%d %H:%M}] falls asleep\n")
+            lines.append(f"[{wake:%Y-%m-%d %H:%M}] wakes up\n")
+
+        shift_date += timedelta(days=1)
+
+    rng.shuffle(lines)
+
+    return "".join(lines)
+
+
+def generate_polymer(size: int, seed: int = 0, unit_types: int = 26) -> str:
+    """Generate a polymer of random units with random polarities."""
+
+    rng = random.Random(seed)
+
+    unit_letters = string.ascii_lowercase[:unit_types]
+    units = rng.choices(unit_letters + unit_letters.upper(), k=size)
+
+    return "".join(units) + "\n"
+
+
+def generate_instructions(size: int, seed: int = 0) -> str:
+    """Generate step dependencies forming an acyclic graph.
+
+    Steps are single uppercase letters, so at most 325 distinct dependencies
+    can be generated no matter how large the size is.
+    """
+
+    rng = random.Random(seed)
+
+    steps = list(string.ascii_uppercase)
+    rng.shuffle(steps)
+
+    possible_dependencies = [
+        (steps[i], steps[j])
+        for i in range(len(steps))
+        for j in range(i + 1, len(steps))
+    ]
+    dependencies = rng.sample(
+        possible_dependencies,
+        min(size, len(possible_dependencies)),
+    )
+
+    return "".join(
+        f"Step {dependency} must be finished before step {step} can begin.\n"
+        for dependency, step in dependencies
+    )
+
+
+def generate_license(size: int, seed: int = 0) -> str:
+    """Generate license data for a tree with the given number of nodes.
+
+    Each node picks a random earlier node as its parent, which keeps the tree
+    shallow enough for the recursive parser.
+    """
+
+    rng = random.Random(seed)
+
+    children: list[list[int]] = [[] for _ in range(size)]
+    for node in range(1, size):
+        children[rng.randrange(node)].append(node)
+
+    numbers = []
+    stack: list[tuple[int, int | None]] = [(0, None)]
+
+    # NOTE: Each node is visited twice: once to write its header and schedule
+    # its children, then again to write its metadata after all its children.
+    while stack:
+        node, metadata_count = stack.pop()
+
+        if metadata_count is not None:
+            numbers.extend(rng.randint(1, 9) for _ in range(metadata_count))
+            continue
+
+        metadata_count = rng.randint(1, MAX_METADATA_COUNT)
+        numbers.extend([len(children[node]), metadata_count])
+
+        stack.append((node, metadata_count))
+        stack.extend((child, None) for child in reversed(children[node]))
+
+    return " ".join(str(number) for number in numbers) + "\n"
+
+
+def generate_star_field(
+    size: int,
+    seed: int = 0,
+    convergence_time: int = DEFAULT_CONVERGENCE_TIME,
+) -> str:
+    """Generate points of light that converge into a message."""
+
+    rng = random.Random(seed)
+
+    lines = []
+    for _ in range(size):
+        target_x = rng.randrange(MESSAGE_WIDTH)
+        target_y = rng.randrange(MESSAGE_HEIGHT)
+
+        velocity_x, velocity_y = 0, 0
+        while velocity_x == 0 and velocity_y == 0:
+            velocity_x = rng.randint(-MAX_STAR_SPEED, MAX_STAR_SPEED)
+            velocity_y = rng.randint(-MAX_STAR_SPEED, MAX_STAR_SPEED)
+
+        x = target_x - velocity_x * convergence_time
+        y = target_y - velocity_y * convergence_time
+        lines.append(
+            f"position=<{x: d}, {y: d}> velocity=<{velocity_x: d}, {velocity_y: d}>\n",
+        )
+
+    return "".join(lines)
+
+
+def generate_serial_numbers(size: int, seed: int = 0) -> str:
+    """Generate grid serial numbers, one per line."""
+
+    rng = random.Random(seed)
+
+    return "".join(f"{rng.randrange(MAX_SERIAL_NUMBER)}\n" for _ in range(size))
+
+
+GENERATORS: dict[int, Generator] = {
+    1: generate_frequencies,
+    2: generate_box_ids,
+    3: generate_claims,
+    4: generate_guard_records,
+    5: generate_polymer,
+    7: generate_instructions,
+    8: generate_license,
+    10: generate_star_field,
+    11: generate_serial_numbers,
+}
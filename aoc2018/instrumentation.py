@@ -0,0 +1,338 @@
+"""
+Opt-in instrumentation of the daily solutions.
+
+An Instrumentation records call counts, cumulative wall time and peak traced
+memory for every public function of the modules it instruments, such as the day
+modules and the shared parser, plus the same measurements for named phases such
+as parsing or solving a part. Phases can optionally be profiled with cProfile.
+
+Functions are only wrapped while instrumentation is active, so solutions run
+untouched when it is disabled.
+"""
+
+import cProfile
+import json
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import wraps
+from inspect import isfunction
+from os import makedirs, path
+from time import perf_counter
+from types import ModuleType
+from typing import Any
+
+METRIC_PREFIX = "aoc2018"
+
+EXCLUDED_FUNCTIONS = {"main"}
+
+
+@dataclass
+class Stats:
+    """Measurements accumulated for an instrumented function or phase."""
+
+    calls: int = 0
+    seconds: float = 0.0
+    peak_memory_bytes: int = 0
+    profile_path: str | None = None
+
+
+@dataclass
+class Frame:
+    """An instrumented call or phase that is currently running."""
+
+    start_memory: int = 0
+    child_peak_memory: int = 0
+
+
+class Instrumentation:
+    """Collects measurements for instrumented functions and phases."""
+
+    def __init__(
+        self,
+        trace_memory: bool = True,
+        profile_dir: str | None = None,
+    ) -> None:
+        self.trace_memory = trace_memory
+        self.profile_dir = profile_dir
+
+        self.functions: dict[str, Stats] = {}
+        self.phases: dict[str, Stats] = {}
+
+        self._frames: list[Frame] = []
+        self._active_calls: dict[str, int] = {}
+        self._profiling = False
+
+    @contextmanager
+    def instrument(self, *modules: ModuleType) -> Iterator["Instrumentation"]:
+        """Wrap the public functions of modules for the duration of a block."""
+
+        originals = []
+
+        for module in modules:
+            for name, function in vars(module).copy().items():
+                if not is_instrumentable(module, name, function):
+                    continue
+
+                originals.append((module, name, function))
+                setattr(module, name, self.wrap(function))
+
+        started_tracing = self._start_tracing()
+
+        try:
+            yield self
+        finally:
+            for module, name, function in originals:
+                setattr(module, name, function)
+
+            if started_tracing:
+                tracemalloc.stop()
+
+    def wrap(self, function: Callable) -> Callable:
+        """Wrap a function so that its calls are measured."""
+
+        name = get_function_name(function)
+
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return self.call(name, function, *args, **kwargs)
+
+        return wrapper
+
+    def call(self, name: str, function: Callable, /, *args: Any, **kwargs: Any) -> Any:
+        """Call a function, measuring the call under a name."""
+
+        stats = self.functions.setdefault(name, Stats())
+        stats.calls += 1
+
+        # NOTE: Recursive calls are counted, but only the outermost call of a
+        # function adds to its time so that time is not counted twice.
+        if self._active_calls.get(name, 0) > 0:
+            return function(*args, **kwargs)
+
+        self._active_calls[name] = 1
+        self._enter_frame()
+        start = perf_counter()
+
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.seconds += perf_counter() - start
+            stats.peak_memory_bytes = max(stats.peak_memory_bytes, self._exit_frame())
+            self._active_calls[name] = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Stats]:
+        """Measure a named phase, profiling it if a profile directory is set."""
+
+        stats = self.phases.setdefault(name, Stats())
+        stats.calls += 1
+
+        profiler = None
+        if self.profile_dir is not None and not self._profiling:
+            profiler = cProfile.Profile()
+            self._profiling = True
+
+        started_tracing = self._start_tracing()
+        self._enter_frame()
+        start = perf_counter()
+
+        if profiler is not None:
+            profiler.enable()
+
+        try:
+            yield stats
+        finally:
+            if profiler is not None:
+                profiler.disable()
+
+            stats.seconds += perf_counter() - start
+            stats.peak_memory_bytes = max(stats.peak_memory_bytes, self._exit_frame())
+
+            if started_tracing:
+                tracemalloc.stop()
+
+            if profiler is not None:
+                self._profiling = False
+                stats.profile_path = self._dump_profile(profiler, name)
+
+    def _start_tracing(self) -> bool:
+        """Start tracing memory allocations if needed, reporting if it started."""
+
+        if not self.trace_memory or tracemalloc.is_tracing():
+            return False
+
+        tracemalloc.start()
+        return True
+
+    def _enter_frame(self) -> None:
+        """Start measuring the peak memory of a call or phase."""
+
+        frame = Frame()
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            current_memory, peak_memory = tracemalloc.get_traced_memory()
+
+            if self._frames:
+                parent = self._frames[-1]
+                parent.child_peak_memory = max(parent.child_peak_memory, peak_memory)
+
+            frame.start_memory = current_memory
+            tracemalloc.reset_peak()
+
+        self._frames.append(frame)
+
+    def _exit_frame(self) -> int:
+        """Finish measuring a call or phase and get its peak memory increase.
+
+        The traced peak is reset whenever a nested call starts, so each frame
+        keeps the highest peak seen by its nested calls and hands its own peak
+        up to its parent.
+        """
+
+        frame = self._frames.pop()
+
+        if not (self.trace_memory and tracemalloc.is_tracing()):
+            return 0
+
+        _, peak_memory = tracemalloc.get_traced_memory()
+        peak_memory = max(peak_memory, frame.child_peak_memory)
+
+        if self._frames:
+            parent = self._frames[-1]
+            parent.child_peak_memory = max(parent.child_peak_memory, peak_memory)
+
+        return max(0, peak_memory - frame.start_memory)
+
+    def _dump_profile(self, profiler: cProfile.Profile, phase_name: str) -> str:
+        """Write the profile of a phase to the profile directory."""
+
+        makedirs(self.profile_dir, exist_ok=True)
+
+        file_name = phase_name.replace(" ", "_").replace("/", "_") + ".prof"
+        file_path = path.join(self.profile_dir, file_name)
+        profiler.dump_stats(file_path)
+
+        return file_path
+
+    def to_dict(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Get all measurements as plain data."""
+
+        return {
+            "functions": {
+                name: asdict(stats) for name, stats in self.functions.items()
+            },
+            "phases": {name: asdict(stats) for name, stats in self.phases.items()},
+        }
+
+    def to_json(self) -> str:
+        """Export all measurements as JSON."""
+
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Export all measurements in the Prometheus text exposition format."""
+
+        lines = []
+
+        for kind, label, collection in (
+            ("function", "function", self.functions),
+            ("phase", "phase", self.phases),
+        ):
+            metrics = (
+                ("calls_total", "counter", "Number of calls.", "calls"),
+                ("seconds_total", "counter", "Cumulative wall time.", "seconds"),
+                (
+                    "peak_memory_bytes",
+                    "gauge",
+                    "Peak traced memory increase.",
+                    "peak_memory_bytes",
+                ),
+            )
+
+            for suffix, metric_type, description, attribute in metrics:
+                metric_name = f"{METRIC_PREFIX}_{kind}_{suffix}"
+                lines.append(f"# HELP {metric_name} {description}")
+                lines.append(f"# TYPE {metric_name} {metric_type}")
+
+                for name, stats in collection.items():
+                    value = getattr(stats, attribute)
+                    lines.append(
+                        f'{metric_name}{{{label}="{escape_label(name)}"}} {value}',
+                    )
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, file_path: str) -> None:
+        """Write all measurements, as Prometheus text for .prom files or JSON."""
+
+        exported = (
+            self.to_prometheus() if file_path.endswith(".prom") else self.to_json()
+        )
+
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(exported)
+
+
+def get_function_name(function: Callable) -> str:
+    """Get the name that a function's measurements are recorded under."""
+
+    return f"{function.__module__}.{function.__qualname__}"
+
+
+def is_instrumentable(module: ModuleType, name: str, value: Any) -> bool:
+    """Determine whether a module attribute is a public function to instrument."""
+
+    return (
+        isfunction(value)
+        and value.__module__ == module.__name__
+        and not name.startswith("_")
+        and name not in EXCLUDED_FUNCTIONS
+    )
+
+
+def escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_active_instrumentation: Instrumentation | None = None
+
+
+@contextmanager
+def enabled(instrumentation: Instrumentation) -> Iterator[Instrumentation]:
+    """Activate an instrumentation for functions decorated with instrumented."""
+
+    global _active_instrumentation
+
+    previous_instrumentation = _active_instrumentation
+    _active_instrumentation = instrumentation
+    started_tracing = instrumentation._start_tracing()
+
+    try:
+        yield instrumentation
+    finally:
+        _active_instrumentation = previous_instrumentation
+
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def instrumented(function: Callable) -> Callable:
+    """Measure a function whenever an instrumentation is enabled.
+
+    When no instrumentation is enabled, the only overhead is a single check.
+    """
+
+    name = get_function_name(function)
+
+    @wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _active_instrumentation is None:
+            return function(*args, **kwargs)
+
+        return _active_instrumentation.call(name, function, *args, **kwargs)
+
+    return wrapper
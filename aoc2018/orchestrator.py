@@ -0,0 +1,216 @@
+"""
+Run many days concurrently in a process pool and aggregate the results.
+
+Days are submitted longest first, using the durations recorded by previous
+runs, so that the slowest days start immediately and the overall wall time
+approaches that of the slowest single day.
+"""
+
+import json
+import traceback
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from os import environ, makedirs, path, remove, replace
+from tempfile import NamedTemporaryFile
+from time import perf_counter
+from typing import NamedTuple
+
+from aoc2018.cache import CACHE_DIR_VARIABLE, DEFAULT_CACHE_DIR
+from aoc2018.days import DAYS
+from aoc2018.runner import run_day
+
+# NOTE: Timings live in their own subdirectory of the cache, so that they are
+# neither counted against the cache's size bound nor evicted with its entries.
+TIMINGS_DIRECTORY = "orchestrator"
+TIMINGS_FILE = "timings.json"
+
+
+class DayReport(NamedTuple):
+    """The outcome of running a single day in the pool."""
+
+    day_number: int
+    answers: dict[int, str]
+    timings: dict[str, float]
+    error: str | None
+
+
+class RunReport(NamedTuple):
+    """The aggregated outcome of running many days."""
+
+    days: list[DayReport]
+    wall_time: float
+
+    @property
+    def failures(self) -> list[DayReport]:
+        """Retrieve the reports of the days that failed."""
+
+        return [day for day in self.days if day.error is not None]
+
+
+def run_day_task(day_number: int, input_path: str | None = None) -> DayReport:
+    """Run a day in a worker process, capturing any failure."""
+
+    start = perf_counter()
+
+    try:
+        result = run_day(day_number, input_path)
+    except Exception:  # noqa: BLE001
+        # NOTE: Each day is its own boundary, so a failure is reported for that
+        # day rather than aborting the whole run.
+        timings = {"total": perf_counter() - start}
+        return DayReport(day_number, {}, timings, traceback.format_exc())
+
+    timings = {**result.timings, "total": perf_counter() - start}
+
+    return DayReport(day_number, result.answers, timings, None)
+
+
+def get_default_timings_path() -> str:
+    """Get the path where the durations of previous runs are recorded."""
+
+    cache_dir = environ.get(CACHE_DIR_VARIABLE, DEFAULT_CACHE_DIR)
+
+    return path.join(cache_dir, TIMINGS_DIRECTORY, TIMINGS_FILE)
+
+
+def load_previous_durations(timings_path: str) -> dict[int, float]:
+    """Load the total duration of each day from previous runs.
+
+    Missing or unreadable timings are treated as if no day had been timed.
+    """
+
+    try:
+        with open(timings_path, encoding="utf-8") as file:
+            return {
+                int(day_number): seconds
+                for day_number, seconds in json.load(file).items()
+            }
+    except (FileNotFoundError, AttributeError, ValueError):
+        return {}
+
+
+def save_durations(timings_path: str, reports: Iterable[DayReport]) -> None:
+    """Record the total duration of each day for ordering future runs."""
+
+    durations = load_previous_durations(timings_path)
+    durations.update((report.day_number, report.timings["total"]) for report in reports)
+
+    # NOTE: The timings are written under a temporary name and renamed into
+    # place, so that concurrent runs never read a partly written file.
+    directory = path.dirname(timings_path)
+    makedirs(directory, exist_ok=True)
+
+    with NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=directory,
+        suffix=".partial",
+        delete=False,
+    ) as file:
+        try:
+            json.dump(durations, file, indent=2)
+        except BaseException:
+            file.close()
+            remove(file.name)
+            raise
+
+    replace(file.name, timings_path)
+
+
+def order_longest_first(
+    day_numbers: Iterable[int],
+    durations: dict[int, float],
+) -> list[int]:
+    """Order days by their previous duration, longest first.
+
+    Days that have never been timed come first, since they could be the
+    longest of all.
+    """
+
+    return sorted(
+        day_numbers,
+        key=lambda day_number: (
+            day_number in durations,
+            -durations.get(day_number, 0.0),
+            day_number,
+        ),
+    )
+
+
+def run_days(
+    day_numbers: Iterable[int] | None = None,
+    max_workers: int | None = None,
+    timings_path: str | None = None,
+) -> RunReport:
+    """Run days concurrently and collect their answers, timings and failures."""
+
+    if day_numbers is None:
+        day_numbers = DAYS
+
+    if timings_path is None:
+        timings_path = get_default_timings_path()
+
+    ordered_day_numbers = order_longest_first(
+        day_numbers,
+        load_previous_durations(timings_path),
+    )
+
+    start = perf_counter()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(run_day_task, day_number)
+            for day_number in ordered_day_numbers
+        ]
+        reports = [future.result() for future in as_completed(futures)]
+
+    wall_time = perf_counter() - start
+
+    save_durations(timings_path, reports)
+    reports.sort(key=lambda report: report.day_number)
+
+    return RunReport(reports, wall_time)
+
+
+def write_report(report: RunReport, file_path: str) -> None:
+    """Write a run report as JSON."""
+
+    data = {
+        "wall_time": report.wall_time,
+        "days": [day._asdict() for day in report.days],
+    }
+
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+
+
+def format_report(report: RunReport) -> str:
+    """Format a run report for display."""
+
+    lines = []
+
+    for day in report.days:
+        total_ms = day.timings["total"] * 1000
+
+        if day.error is not None:
+            last_line = day.error.strip().splitlines()[-1]
+            lines.append(
+                f"Day {day.day_number:>2}  FAILED {total_ms:>10.3f} ms  {last_line}"
+            )
+            continue
+
+        answers = "  ".join(
+            f"Part {part}: {answer.splitlines()[0] if answer else answer}"
+            for part, answer in day.answers.items()
+        )
+        line = f"Day {day.day_number:>2}  ok     {total_ms:>10.3f} ms  {answers}"
+        lines.append(line.rstrip())
+
+    slowest = max((day.timings["total"] for day in report.days), default=0.0)
+    lines.append(
+        f"Wall time {report.wall_time * 1000:.3f} ms"
+        f" (slowest day {slowest * 1000:.3f} ms,"
+        f" {len(report.failures)} failed)",
+    )
+
+    return "\n".join(lines)
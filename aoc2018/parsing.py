@@ -0,0 +1,455 @@
+"""
+Bulk parsing of puzzle inputs into integer arrays.
+
+Rather than matching each line with a regex, a whole input is read as bytes,
+every integer in it is extracted in a single vectorized pass, and the flat
+result is reshaped into one row per line.
+
+Each line must also follow the literal layout of its day. The layout of a line
+is what remains once each number is replaced by a single marker, and it is
+compared against the expected layouts all at once. Lines with a different
+layout, a stray sign or a number too large for 64 bits are reported with the
+same errors as the day parsers.
+"""
+
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+NEWLINE = ord("\n")
+CARRIAGE_RETURN = ord("\r")
+SPACE = ord(" ")
+ZERO = ord("0")
+NINE = ord("9")
+
+NUMBER_MARKER = 0
+WHITESPACE = b" \t\r\n"
+
+
+def create_layout(template: str) -> bytes:
+    """Create the layout of a line from a template with {} for each number."""
+
+    return template.replace("{}", chr(NUMBER_MARKER)).encode("ascii")
+
+
+FREQUENCY_LAYOUT = create_layout("{}")
+CLAIM_LAYOUT = create_layout("#{} @ {},{}: {}x{}")
+POINT_LAYOUT = create_layout("position=<{},{}> velocity=<{},{}>")
+
+SHIFT_START_KIND = 0
+SLEEP_KIND = 1
+WAKE_KIND = 2
+
+# NOTE: Record layouts are listed in the order of their kinds, so the index of
+# the layout a line matches is the kind of its record.
+RECORD_LAYOUTS = (
+    create_layout("[{}-{}-{} {}:{}] Guard #{} begins shift"),
+    create_layout("[{}-{}-{} {}:{}] falls asleep"),
+    create_layout("[{}-{}-{} {}:{}] wakes up"),
+)
+RECORD_WIDTH = 7
+
+# NOTE: Claims are stored as 32-bit integers by day 3, so larger values are
+# rejected here rather than wrapping around.
+CLAIM_MAX_VALUE = np.iinfo(np.int32).max
+
+NUMBER_REGEX = re.compile(rb"[+-]?\d+")
+INSTRUCTION_REGEX = re.compile(
+    rb"^Step ([A-Z]) must be finished before step ([A-Z]) can begin\.\r?$",
+    re.MULTILINE,
+)
+
+
+class ScannedIntegers(NamedTuple):
+    """The integers found in an input and where they appear."""
+
+    buffer: np.ndarray
+    values: np.ndarray
+    number_mask: np.ndarray
+    number_starts: np.ndarray
+    line_numbers: np.ndarray
+    line_starts: np.ndarray
+    line_ends: np.ndarray
+    overflowing_lines: np.ndarray
+
+
+def read_bytes(file_path: str) -> bytes:
+    """Read a whole file as bytes."""
+
+    with open(file_path, "rb") as file:
+        return file.read()
+
+
+def get_line_bounds(buffer: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Find where each line of an input starts and ends.
+
+    A final newline does not start another line.
+    """
+
+    line_ends = np.flatnonzero(buffer == NEWLINE)
+    if len(buffer) > 0 and buffer[-1] != NEWLINE:
+        line_ends = np.append(line_ends, len(buffer))
+
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1)).astype(np.int64)
+
+    return line_starts[: len(line_ends)], line_ends
+
+
+def get_line_numbers(positions: np.ndarray, line_starts: np.ndarray) -> np.ndarray:
+    """Find the line that each of a few sorted byte positions falls on."""
+
+    return np.searchsorted(line_starts, positions, side="right") - 1
+
+
+def find_overflowing_lines(
+    data: bytes,
+    values: np.ndarray,
+    number_starts: np.ndarray,
+    line_numbers: np.ndarray,
+) -> np.ndarray:
+    """Find the lines holding a number that does not fit in 64 bits.
+
+    Such numbers are clamped to the limits of int64 when converted, so only
+    the numbers that came out at a limit need to be read again.
+    """
+
+    limits = np.iinfo(np.int64)
+    overflowing_lines = []
+
+    at_limit = np.flatnonzero((values == limits.max) | (values == limits.min))
+    for index in at_limit:
+        number = NUMBER_REGEX.match(data, int(number_starts[index])).group()
+        if not limits.min <= int(number) <= limits.max:
+            overflowing_lines.append(int(line_numbers[index]))
+
+    return np.array(overflowing_lines, dtype=np.int64)
+
+
+def scan_integers(data: bytes, signs: bytes = b"") -> ScannedIntegers:
+    """Extract every integer from an input in one pass.
+
+    A sign belongs to a number only when it directly precedes a digit and does
+    not follow one, so dates such as 1518-11-01 are read as three positive
+    numbers. Any other sign is left in place to be rejected by the layout.
+    """
+
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    line_starts, line_ends = get_line_bounds(buffer)
+
+    # NOTE: Bytes below "0" wrap around when subtracted, so a single unsigned
+    # comparison finds the digits.
+    is_digit = (buffer - np.uint8(ZERO)) <= NINE - ZERO
+
+    is_sign = np.zeros_like(is_digit)
+    for sign in signs:
+        is_sign[:-1] |= buffer[:-1] == sign
+    is_sign[:-1] &= is_digit[1:]
+    is_sign[1:] &= ~is_digit[:-1]
+
+    number_mask = is_digit | is_sign
+    is_number_start = is_digit.copy()
+    is_number_start[1:] &= ~number_mask[:-1]
+    is_number_start |= is_sign
+    number_starts = np.flatnonzero(is_number_start)
+
+    first_numbers = np.searchsorted(number_starts, line_starts)
+    number_counts = np.diff(first_numbers, append=len(number_starts))
+    line_numbers = np.repeat(np.arange(len(line_starts)), number_counts)
+
+    if len(number_starts) == 0:
+        values = np.zeros(0, dtype=np.int64)
+    else:
+        cleaned = np.where(number_mask, buffer, np.uint8(SPACE))
+        values = np.fromstring(cleaned.tobytes(), dtype=np.int64, sep=" ")
+
+    overflowing_lines = find_overflowing_lines(
+        data,
+        values,
+        number_starts,
+        line_numbers,
+    )
+
+    return ScannedIntegers(
+        buffer,
+        values,
+        number_mask,
+        number_starts,
+        line_numbers,
+        line_starts,
+        line_ends,
+        overflowing_lines,
+    )
+
+
+def match_layouts(
+    scanned: ScannedIntegers,
+    layouts: tuple[bytes, ...],
+    ignored: bytes = b"\r",
+) -> np.ndarray:
+    """Find the index of the layout that each line follows, or -1 if none.
+
+    Ignored bytes are left out of both the lines and the layouts, which lets
+    padding vary between lines.
+    """
+
+    buffer = scanned.buffer
+    line_count = len(scanned.line_ends)
+
+    kept = ~scanned.number_mask
+    kept[scanned.number_starts] = True
+    for byte in ignored:
+        kept &= buffer != byte
+
+    # NOTE: Newlines are kept, so the lines can be split apart again within
+    # the much shorter layout bytes.
+    layout_bytes = np.where(scanned.number_mask, np.uint8(NUMBER_MARKER), buffer)
+    layout_bytes = layout_bytes[kept]
+
+    layout_ends = np.flatnonzero(layout_bytes == NEWLINE)[:line_count]
+    if len(layout_ends) < line_count:
+        layout_ends = np.append(layout_ends, len(layout_bytes))
+
+    layout_offsets = np.concatenate(([0], layout_ends[:-1] + 1))[:line_count]
+    layout_lengths = layout_ends - layout_offsets
+
+    matches = np.full(line_count, -1, dtype=np.int64)
+
+    for index, layout in enumerate(layouts):
+        for byte in ignored:
+            layout = layout.replace(bytes([byte]), b"")
+
+        expected = np.frombuffer(layout, dtype=np.uint8)
+        candidates = np.flatnonzero(
+            (matches < 0) & (layout_lengths == len(expected)),
+        )
+
+        rows = layout_bytes[
+            layout_offsets[candidates, np.newaxis] + np.arange(len(expected))
+        ]
+        matches[candidates[(rows == expected).all(axis=1)]] = index
+
+    matches[scanned.overflowing_lines] = -1
+
+    return matches
+
+
+def get_line(data: bytes, scanned: ScannedIntegers, line_number: int) -> str:
+    """Get the text of a line for an error message."""
+
+    start = scanned.line_starts[line_number]
+    end = scanned.line_ends[line_number]
+
+    return data[start:end].decode("utf-8", errors="replace")
+
+
+def check_lines(
+    data: bytes,
+    scanned: ScannedIntegers,
+    is_valid: np.ndarray,
+    error_message: str,
+) -> None:
+    """Report the first invalid line of an input."""
+
+    invalid_lines = np.flatnonzero(~is_valid)
+    if len(invalid_lines) > 0:
+        line = get_line(data, scanned, int(invalid_lines[0]))
+        raise ValueError(f"{error_message}: {line}")
+
+
+def parse_layout(
+    data: bytes,
+    layout: bytes,
+    error_message: str,
+    signs: bytes = b"",
+    ignored: bytes = b"\r",
+    max_value: int | None = None,
+) -> np.ndarray:
+    """Parse an input whose lines all follow one layout, one row per line.
+
+    Lines holding a value above the maximum, if one is given, are invalid.
+    """
+
+    scanned = scan_integers(data, signs)
+
+    is_valid = match_layouts(scanned, (layout,), ignored) == 0
+    if max_value is not None:
+        is_valid[scanned.line_numbers[scanned.values > max_value]] = False
+
+    check_lines(data, scanned, is_valid, error_message)
+
+    return scanned.values.reshape(len(is_valid), layout.count(NUMBER_MARKER))
+
+
+def read_layout(
+    file_path: str,
+    layout: bytes,
+    error_message: str,
+    signs: bytes = b"",
+    ignored: bytes = b"\r",
+    max_value: int | None = None,
+) -> np.ndarray:
+    """Read an input whose lines all follow one layout, one row per line."""
+
+    return parse_layout(
+        read_bytes(file_path),
+        layout,
+        error_message,
+        signs,
+        ignored,
+        max_value,
+    )
+
+
+def is_number_per_line(buffer: np.ndarray, signs: bytes) -> bool:
+    """Check that every line of an input holds a single number and nothing else.
+
+    Unlike a general layout, such lines can be checked by comparing each byte
+    with its neighbours, which takes a few passes over the input. A carriage
+    return may end a line.
+    """
+
+    if len(buffer) == 0:
+        return True
+
+    is_digit = (buffer >= ZERO) & (buffer <= NINE)
+    is_newline = buffer == NEWLINE
+    is_return = buffer == CARRIAGE_RETURN
+
+    is_sign = np.zeros_like(is_digit)
+    for sign in signs:
+        is_sign |= buffer == sign
+
+    starts_number = is_digit | is_sign
+
+    return bool(
+        (starts_number | is_newline | is_return).all()
+        and starts_number[0]
+        and not is_sign[-1]
+        and not (is_newline[:-1] & ~starts_number[1:]).any()
+        and not (is_sign[1:] & ~is_newline[:-1]).any()
+        and not (is_sign[:-1] & ~is_digit[1:]).any()
+        and not (is_return[1:] & ~is_digit[:-1]).any()
+        and not (is_return[:-1] & ~is_newline[1:]).any(),
+    )
+
+
+def read_frequencies(file_path: str) -> np.ndarray:
+    """Read frequency changes as a flat array."""
+
+    data = read_bytes(file_path)
+
+    # NOTE: Frequencies are one number per line, so a valid input is checked
+    # and converted directly. Anything else, including numbers clamped to the
+    # limits of 64 bits, is left to the layout parser to report.
+    if is_number_per_line(np.frombuffer(data, dtype=np.uint8), b"+-"):
+        if not data:
+            return np.zeros(0, dtype=np.int64)
+
+        frequencies = np.fromstring(data, dtype=np.int64, sep=" ")
+
+        limits = np.iinfo(np.int64)
+        if limits.min < frequencies.min() and frequencies.max() < limits.max:
+            return frequencies
+
+    frequencies = parse_layout(
+        data,
+        FREQUENCY_LAYOUT,
+        "Invalid frequency",
+        signs=b"+-",
+    )
+
+    return frequencies[:, 0]
+
+
+def read_claims(file_path: str) -> np.ndarray:
+    """Read claims as rows of id, x, y, width and height."""
+
+    return read_layout(
+        file_path,
+        CLAIM_LAYOUT,
+        "Invalid claim",
+        max_value=CLAIM_MAX_VALUE,
+    )
+
+
+def read_records(file_path: str) -> np.ndarray:
+    """Read guard records as rows of kind, timestamp fields and guard ID.
+
+    Records without a guard have an ID of -1.
+    """
+
+    data = read_bytes(file_path)
+    scanned = scan_integers(data)
+
+    kinds = match_layouts(scanned, RECORD_LAYOUTS)
+    check_lines(data, scanned, kinds >= 0, "Invalid record")
+
+    # NOTE: Each line's integers are copied into its row, leaving the guard ID
+    # column at -1 for lines that only hold a timestamp.
+    records = np.full((len(kinds), RECORD_WIDTH), -1, dtype=np.int64)
+    records[:, 0] = kinds
+
+    counts = np.bincount(scanned.line_numbers, minlength=len(kinds))
+    line_offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    columns = np.arange(len(scanned.values)) - line_offsets[scanned.line_numbers]
+    records[scanned.line_numbers, columns + 1] = scanned.values
+
+    return records
+
+
+def read_instructions(file_path: str) -> np.ndarray:
+    """Read instructions as rows of step and dependency character codes."""
+
+    data = read_bytes(file_path)
+    matches = INSTRUCTION_REGEX.findall(data)
+
+    line_count = data.count(b"\n") + (0 if data.endswith(b"\n") else 1)
+    if not data:
+        line_count = 0
+
+    if len(matches) != line_count:
+        for line in data.decode("utf-8", errors="replace").splitlines():
+            if not INSTRUCTION_REGEX.match(line.encode("utf-8")):
+                raise ValueError(f"Invalid instruction: {line}")
+
+    instructions = np.frombuffer(b"".join(a + b for a, b in matches), dtype=np.uint8)
+
+    # NOTE: An instruction names its dependency first, but is stored with the
+    # step first to match the order of the day's Instruction fields.
+    return instructions.reshape(-1, 2)[:, ::-1].copy()
+
+
+def read_license(file_path: str) -> np.ndarray:
+    """Read license data as a flat array of whitespace-separated numbers."""
+
+    data = read_bytes(file_path)
+    scanned = scan_integers(data)
+
+    is_separator = np.isin(
+        scanned.buffer,
+        np.frombuffer(WHITESPACE, dtype=np.uint8),
+    )
+    invalid_bytes = np.flatnonzero(~(scanned.number_mask | is_separator))
+
+    is_valid = np.ones(len(scanned.line_starts), dtype=bool)
+    is_valid[get_line_numbers(invalid_bytes, scanned.line_starts)] = False
+    is_valid[scanned.overflowing_lines] = False
+    check_lines(data, scanned, is_valid, "Invalid license data")
+
+    return scanned.values
+
+
+def read_point_data(file_path: str) -> np.ndarray:
+    """Read points of light as rows of x, y, x velocity and y velocity.
+
+    Spaces are ignored, since coordinates are padded to line up.
+    """
+
+    return read_layout(
+        file_path,
+        POINT_LAYOUT,
+        "Invalid point data",
+        signs=b"-",
+        ignored=b" \r",
+    )
@@ -0,0 +1,143 @@
+"""
+Run a single day's solution and time each phase.
+"""
+
+from contextlib import ExitStack, nullcontext
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from aoc2018.days import (
+    get_day,
+    get_default_input_path,
+    get_parsing,
+    import_day_module,
+)
+
+# NOTE: The cache and instrumentation are only given by callers that already
+# imported them, so importing them here would only slow down plain runs.
+if TYPE_CHECKING:
+    from aoc2018.cache import ResultCache
+    from aoc2018.instrumentation import Instrumentation
+
+PARTS = (1, 2)
+
+
+class DayResult(NamedTuple):
+    """The answers of a day's solution and the time spent in each phase."""
+
+    day_number: int
+    answers: dict[int, str]
+    timings: dict[str, float]
+
+
+def run_day(
+    day_number: int,
+    input_path: str | None = None,
+    parts: tuple[int, ...] = PARTS,
+    instrumentation: "Instrumentation | None" = None,
+    cache: "ResultCache | None" = None,
+) -> DayResult:
+    """Parse a day's input and solve the requested parts.
+
+    Timings are recorded in seconds for the import, the parse, and each part.
+    Parts without a solution are skipped. When an instrumentation is given, the
+    day's functions and each phase are measured by it as well.
+
+    Answers are returned as strings, so they look the same whether they were
+    just solved or loaded from the cache. When a cache is given, cached answers
+    are returned without solving their parts, and a cached parsed input
+    replaces parsing.
+    """
+
+    day = get_day(day_number)
+    if input_path is None:
+        input_path = get_default_input_path(day_number)
+
+    timings = {}
+
+    start = perf_counter()
+    module = import_day_module(day)
+    timings["import"] = perf_counter() - start
+
+    def phase(name: str) -> Any:
+        """Measure a phase with the instrumentation, if there is one."""
+
+        if instrumentation is None:
+            return nullcontext()
+
+        return instrumentation.phase(f"day {day_number} {name}")
+
+    answers = {}
+    solvers = {1: day.part_1, 2: day.part_2}
+    unsolved_parts = [part for part in parts if solvers[part] is not None]
+
+    cache_key = None
+    if cache is not None:
+        start = perf_counter()
+        cache_key = cache.get_key(day_number, module, input_path)
+
+        cached_answers = cache.load_answers(cache_key)
+        answers.update(
+            (part, cached_answers[part])
+            for part in unsolved_parts
+            if part in cached_answers
+        )
+        unsolved_parts = [part for part in unsolved_parts if part not in answers]
+        timings["cache"] = perf_counter() - start
+
+        if not unsolved_parts and answers:
+            return DayResult(day_number, answers, timings)
+
+    with ExitStack() as stack:
+        if instrumentation is not None:
+            # NOTE: Most days are parsed by the shared bulk parser rather than
+            # their own read functions, so it is instrumented alongside them.
+            stack.enter_context(instrumentation.instrument(module, get_parsing()))
+
+        data = None
+        if cache_key is not None:
+            start = perf_counter()
+            data = cache.load_parsed(day_number, module, cache_key)
+            if data is not None:
+                timings["parse (cached)"] = perf_counter() - start
+
+        if data is None:
+            start = perf_counter()
+            with phase("parse"):
+                data = day.parse(module, input_path)
+            timings["parse"] = perf_counter() - start
+
+            if cache_key is not None:
+                cache.store_parsed(day_number, module, cache_key, data)
+
+        solved_answers = {}
+        for part in unsolved_parts:
+            start = perf_counter()
+            with phase(f"part {part}"):
+                solved_answers[part] = str(solvers[part](module, data))
+            timings[f"part {part}"] = perf_counter() - start
+
+        if cache_key is not None and solved_answers:
+            cache.store_answers(cache_key, solved_answers)
+
+    answers.update(solved_answers)
+
+    return DayResult(day_number, dict(sorted(answers.items())), timings)
+
+
+def format_day_result(result: DayResult, quiet: bool = False) -> str:
+    """Format the answers and timings of a day for display."""
+
+    lines = [f"Day {result.day_number}"]
+
+    if not quiet:
+        for part, answer in result.answers.items():
+            answer_text = str(answer)
+            separator = "\n" if "\n" in answer_text else " "
+
+            lines.append(f"  Part {part}:{separator}{answer_text}")
+
+    for phase, seconds in result.timings.items():
+        lines.append(f"  {phase:<8}{seconds * 1000:>10.3f} ms")
+
+    return "\n".join(lines)
@@ -0,0 +1,444 @@
+"""
+Long-running solver service that keeps solutions warm between requests.
+
+Requests are solved in a pool of worker processes, so that concurrent requests
+run in parallel despite the solutions being pure Python. Each worker imports
+every day module once when it starts, so compiled regexes and module level
+caches such as day 11's power grids stay in memory, and keeps the inputs it
+parsed recently keyed by the digest of their contents. Requests are JSON
+objects, one per line, sent over a Unix domain socket or a localhost TCP
+connection:
+
+    {"id": 1, "day": 3, "path": "day3/input.txt", "parts": [1, 2]}
+    {"id": 2, "day": 1, "input": "+1\\n-2\\n+3\\n"}
+
+Only paths under the service's root directory may be read. Each response is a
+JSON object on its own line with the id, the answers by part and the latency
+of its request, or an error message. Requests sent on one connection without
+waiting are solved concurrently, so their responses may arrive out of order. Errors raised while solving are reported by type
+only, so that the contents of an input are never sent back.
+"""
+
+import asyncio
+import hashlib
+import json
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from os import cpu_count, path, remove
+from time import perf_counter
+from types import ModuleType
+from typing import Any
+
+from aoc2018.days import DAYS, REPOSITORY_ROOT, get_day, import_day_module
+from aoc2018.runner import PARTS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PARSED_INPUT_CACHE_SIZE = 64
+
+# NOTE: Inputs can be sent inline, so lines are allowed to be far longer than
+# the 64 KiB that asyncio streams accept by default.
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+
+class RequestError(Exception):
+    """An error in a request, whose message is safe to send back."""
+
+
+class SolverWorker:
+    """The warm state of a worker process: imported days and parsed inputs."""
+
+    def __init__(
+        self,
+        parsed_input_cache_size: int = DEFAULT_PARSED_INPUT_CACHE_SIZE,
+    ) -> None:
+        self.parsed_input_cache_size = parsed_input_cache_size
+
+        self.modules: dict[int, ModuleType] = {}
+        self.import_errors: dict[int, str] = {}
+
+        self._parsed_inputs: OrderedDict[tuple[int, str], Any] = OrderedDict()
+
+    def warm_up(self) -> None:
+        """Import every day module ahead of the first request."""
+
+        for day_number, day in DAYS.items():
+            try:
+                self.modules[day_number] = import_day_module(day)
+            except Exception as e:  # noqa: BLE001
+                # NOTE: A day that fails to import is reported by the requests
+                # for it, rather than keeping the other days from being served.
+                self.import_errors[day_number] = type(e).__name__
+
+    def solve(self, request: dict[str, Any]) -> dict[str, str]:
+        """Solve the parts named by a validated request."""
+
+        day_number = request["day"]
+        day = get_day(day_number)
+
+        if day_number in self.import_errors:
+            raise RequestError(
+                f"Day {day_number} failed to import: {self.import_errors[day_number]}",
+            )
+
+        if day_number not in self.modules:
+            self.modules[day_number] = import_day_module(day)
+
+        module = self.modules[day_number]
+        data = self.get_parsed_input(day_number, module, request)
+
+        answers = {}
+        solvers = {1: day.part_1, 2: day.part_2}
+
+        for part in request["parts"]:
+            solver = solvers[part]
+            if solver is not None:
+                answers[str(part)] = str(solver(module, data))
+
+        return answers
+
+    def get_parsed_input(
+        self,
+        day_number: int,
+        module: ModuleType,
+        request: dict[str, Any],
+    ) -> Any:
+        """Get the parsed input of a request, reusing it if seen recently."""
+
+        if "input" in request:
+            content = request["input"].encode("utf-8")
+        else:
+            with open(request["path"], "rb") as file:
+                content = file.read()
+
+        key = (day_number, hashlib.sha256(content).hexdigest())
+
+        if key in self._parsed_inputs:
+            self._parsed_inputs.move_to_end(key)
+            return self._parsed_inputs[key]
+
+        data = self.parse(day_number, module, request, content)
+
+        self._parsed_inputs[key] = data
+        while len(self._parsed_inputs) > self.parsed_input_cache_size:
+            self._parsed_inputs.popitem(last=False)
+
+        return data
+
+    def parse(
+        self,
+        day_number: int,
+        module: ModuleType,
+        request: dict[str, Any],
+        content: bytes,
+    ) -> Any:
+        """Parse the input of a request with the day's registered parser."""
+
+        day = get_day(day_number)
+
+        if "path" in request:
+            return day.parse(module, request["path"])
+
+        # NOTE: The day parsers read from files, so inline inputs are written
+        # to a temporary file first.
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as file:
+            file.write(content)
+
+        try:
+            return day.parse(module, file.name)
+        finally:
+            remove(file.name)
+
+
+_worker: SolverWorker | None = None
+
+
+def _start_worker(parsed_input_cache_size: int) -> None:
+    """Warm up the state of a new worker process."""
+
+    global _worker
+
+    _worker = SolverWorker(parsed_input_cache_size)
+    _worker.warm_up()
+
+
+def _is_worker_warm() -> bool:
+    """Report whether the current worker process has been warmed up."""
+
+    return _worker is not None
+
+
+def _solve_in_worker(request: dict[str, Any]) -> dict[str, str]:
+    """Solve a request with the warm state of the current worker process."""
+
+    return _worker.solve(request)
+
+
+class SolverService:
+    """Answers requests for the daily solutions using warm worker processes."""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        parsed_input_cache_size: int = DEFAULT_PARSED_INPUT_CACHE_SIZE,
+        root: str = REPOSITORY_ROOT,
+    ) -> None:
+        self.max_workers = max_workers or cpu_count() or 1
+        self.root = path.realpath(root)
+
+        self.executor: Executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_start_worker,
+            initargs=(parsed_input_cache_size,),
+        )
+
+    def validate_request(self, request: Any) -> dict[str, Any]:
+        """Check a request and normalize its fields before it is solved."""
+
+        if not isinstance(request, dict):
+            raise RequestError("A request must be a JSON object.")
+
+        try:
+            day_number = int(request["day"])
+            parts = [int(part) for part in request.get("parts", PARTS)]
+        except (KeyError, TypeError, ValueError) as e:
+            raise RequestError("A request needs a day and optional parts.") from e
+
+        if day_number not in DAYS:
+            raise RequestError(f"No solution for day {day_number}.")
+
+        if any(part not in PARTS for part in parts):
+            raise RequestError(f"Parts must be among {list(PARTS)}.")
+
+        validated_request = {"day": day_number, "parts": parts}
+
+        if isinstance(request.get("input"), str):
+            validated_request["input"] = request["input"]
+        elif isinstance(request.get("path"), str):
+            validated_request["path"] = self.resolve_path(request["path"])
+        else:
+            raise RequestError("A request needs either an input or a path.")
+
+        return validated_request
+
+    def resolve_path(self, file_path: str) -> str:
+        """Resolve a requested path, which must lie under the service's root."""
+
+        resolved_path = path.realpath(path.join(self.root, file_path))
+
+        if path.commonpath((self.root, resolved_path)) != self.root:
+            raise RequestError(f"Paths must be under {self.root}.")
+
+        if not path.isfile(resolved_path):
+            raise RequestError(f"No input file at {file_path}.")
+
+        return resolved_path
+
+    async def handle_request(self, request: Any) -> dict[str, Any]:
+        """Answer a single request, reporting failures in the response."""
+
+        start = perf_counter()
+        response: dict[str, Any] = {
+            "id": request.get("id") if isinstance(request, dict) else None,
+        }
+
+        try:
+            validated_request = self.validate_request(request)
+
+            loop = asyncio.get_running_loop()
+            response["answers"] = await loop.run_in_executor(
+                self.executor,
+                _solve_in_worker,
+                validated_request,
+            )
+        except RequestError as e:
+            response["error"] = str(e)
+        except Exception as e:  # noqa: BLE001
+            # NOTE: Each request is its own boundary. Messages may quote the
+            # input, so only the type of the error is sent back.
+            response["error"] = f"{type(e).__name__} while solving the request."
+
+        response["latency"] = perf_counter() - start
+
+        return response
+
+    async def warm_up(self) -> None:
+        """Start the worker processes ahead of the first request."""
+
+        loop = asyncio.get_running_loop()
+
+        # NOTE: Workers are started on demand, so one task is submitted per
+        # worker to have them all import the days before serving.
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, _is_worker_warm)
+                for _ in range(self.max_workers)
+            ),
+        )
+
+    async def answer_line(
+        self,
+        line: bytes,
+        writer: asyncio.StreamWriter,
+        write_lock: asyncio.Lock,
+    ) -> None:
+        """Answer the request on a line and write its response."""
+
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = {"id": None, "error": f"Invalid request: {e}"}
+        else:
+            response = await self.handle_request(request)
+
+        # NOTE: Responses of concurrent requests are written whole, one at a
+        # time, so that their lines never interleave.
+        async with write_lock:
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+            await writer.drain()
+
+    async def handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Answer requests from a connection until it is closed.
+
+        Each request is answered in its own task, so requests sent without
+        waiting for a response are solved concurrently and answered in the
+        order they finish.
+        """
+
+        write_lock = asyncio.Lock()
+        tasks: set[asyncio.Task] = set()
+
+        try:
+            while True:
+                try:
+                    line = await read_line(reader)
+                except RequestError as e:
+                    line = json.dumps({"id": None, "error": str(e)}).encode("utf-8")
+                    async with write_lock:
+                        writer.write(line + b"\n")
+                        await writer.drain()
+                    continue
+
+                if not line:
+                    break
+
+                task = asyncio.create_task(
+                    self.answer_line(line, writer, write_lock),
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            writer.close()
+            await writer.wait_closed()
+
+    async def serve(
+        self,
+        socket_path: str | None = None,
+        port: int | None = None,
+    ) -> None:
+        """Serve requests on a Unix domain socket or a localhost port."""
+
+        await self.warm_up()
+
+        if socket_path is not None:
+            server = await asyncio.start_unix_server(
+                self.handle_connection,
+                socket_path,
+                limit=MAX_REQUEST_BYTES,
+            )
+        elif port is not None:
+            server = await asyncio.start_server(
+                self.handle_connection,
+                DEFAULT_HOST,
+                port,
+                limit=MAX_REQUEST_BYTES,
+            )
+        else:
+            raise ValueError("Either a socket path or a port is required.")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+
+async def skip_line(reader: asyncio.StreamReader) -> None:
+    """Discard the rest of a line that is over the length limit."""
+
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+async def read_line(reader: asyncio.StreamReader) -> bytes:
+    """Read a line from a connection, or an empty line once it is closed.
+
+    A line over the length limit is skipped and reported as a request error.
+    """
+
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+    except asyncio.LimitOverrunError:
+        await skip_line(reader)
+        raise RequestError(
+            f"Requests must be shorter than {MAX_REQUEST_BYTES} bytes.",
+        ) from None
+
+
+async def send_request_async(
+    request: dict[str, Any],
+    socket_path: str | None = None,
+    port: int | None = None,
+) -> dict[str, Any]:
+    """Send a request to a running service and wait for its response."""
+
+    if socket_path is not None:
+        reader, writer = await asyncio.open_unix_connection(
+            socket_path,
+            limit=MAX_REQUEST_BYTES,
+        )
+    else:
+        reader, writer = await asyncio.open_connection(
+            DEFAULT_HOST,
+            port,
+            limit=MAX_REQUEST_BYTES,
+        )
+
+    try:
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def send_request(
+    request: dict[str, Any],
+    socket_path: str | None = None,
+    port: int | None = None,
+) -> dict[str, Any]:
+    """Send a request to a running service from synchronous code."""
+
+    if "path" in request:
+        request = {**request, "path": path.abspath(request["path"])}
+
+    return asyncio.run(send_request_async(request, socket_path, port))
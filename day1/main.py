@@ -4,11 +4,17 @@ Chronal Calibration
 https://adventofcode.com/2018/day/1
 """
 
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from itertools import cycle
 from os import path
 
+import numpy as np
+
 INPUT_FILE = "input.txt"
 
+DEFAULT_MAX_SEEN_FREQUENCY_BYTES = 128 * 1024 * 1024
+
 
 def read_frequencies(file_path: str) -> list[int]:
     """Read frequencies from a file."""
@@ -40,6 +46,148 @@ def find_first_repeat_frequency(frequencies: list[int]) -> int:
     raise ValueError("No frequency repeated.")
 
 
+@dataclass
+class FrequencyCalibrator:
+    """Tracks the frequency as changes arrive in batches.
+
+    Frequencies seen so far are stored as sorted runs of 64-bit integers. A
+    new run is added per batch, and runs of similar size are merged so that
+    only a logarithmic number of runs needs to be searched. Recording more
+    frequencies than fit in max_seen_bytes raises an error, unless it is None.
+    """
+
+    current_frequency: int = 0
+    first_repeat_frequency: int | None = None
+    max_seen_bytes: int | None = DEFAULT_MAX_SEEN_FREQUENCY_BYTES
+    seen_frequency_runs: list[np.ndarray] = field(
+        default_factory=lambda: [np.zeros(1, dtype=np.int64)],
+    )
+
+    @property
+    def seen_frequency_count(self) -> int:
+        """Retrieve the number of distinct frequencies recorded."""
+
+        return sum(len(run) for run in self.seen_frequency_runs)
+
+    @property
+    def seen_frequency_bytes(self) -> int:
+        """Retrieve the memory used to record frequencies, in bytes."""
+
+        return sum(run.nbytes for run in self.seen_frequency_runs)
+
+    def extend(self, frequency_changes: Iterable[int] | np.ndarray) -> int | None:
+        """Apply a batch of frequency changes.
+
+        Returns the first frequency that appeared twice, if any has so far.
+        """
+
+        changes = get_frequency_change_array(frequency_changes)
+        if len(changes) == 0:
+            return self.first_repeat_frequency
+
+        frequencies = self.current_frequency + np.cumsum(changes)
+
+        # NOTE: Once a frequency has repeated, later ones no longer matter, so
+        # nothing more is recorded and memory stops growing.
+        if self.first_repeat_frequency is None:
+            repeat_index = self.find_first_repeat_index(frequencies)
+            if repeat_index is None:
+                self.record_frequencies(np.sort(frequencies))
+            else:
+                self.first_repeat_frequency = int(frequencies[repeat_index])
+
+        self.current_frequency = int(frequencies[-1])
+
+        return self.first_repeat_frequency
+
+    def find_first_repeat_index(self, frequencies: np.ndarray) -> int | None:
+        """Find the index of the first frequency in a batch that was seen before."""
+
+        is_repeat = np.zeros(len(frequencies), dtype=bool)
+
+        for run in self.seen_frequency_runs:
+            indices = np.searchsorted(run, frequencies).clip(max=len(run) - 1)
+            is_repeat |= run[indices] == frequencies
+
+        # NOTE: A stable sort keeps equal frequencies in batch order, so every
+        # one but the first of each value is a repeat within the batch.
+        order = np.argsort(frequencies, kind="stable")
+        sorted_frequencies = frequencies[order]
+        is_repeat[order[1:][sorted_frequencies[1:] == sorted_frequencies[:-1]]] = True
+
+        repeat_indices = np.flatnonzero(is_repeat)
+
+        return int(repeat_indices[0]) if len(repeat_indices) > 0 else None
+
+    def record_frequencies(self, sorted_frequencies: np.ndarray) -> None:
+        """Record a sorted run of distinct frequencies, merging similar runs.
+
+        Raises an error, leaving the recorded frequencies as they were, if the
+        run does not fit in the memory bound.
+        """
+
+        seen_bytes = self.seen_frequency_bytes + sorted_frequencies.nbytes
+        if self.max_seen_bytes is not None and seen_bytes > self.max_seen_bytes:
+            raise ValueError(
+                f"Recording {seen_bytes} bytes of frequencies exceeds the bound "
+                f"of {self.max_seen_bytes} bytes.",
+            )
+
+        runs = self.seen_frequency_runs
+        runs.append(sorted_frequencies)
+
+        while len(runs) > 1 and len(runs[-2]) <= 2 * len(runs[-1]):
+            newest_run = runs.pop()
+            runs[-1] = merge_sorted_runs(runs[-1], newest_run)
+
+
+def get_frequency_change_array(
+    frequency_changes: Iterable[int] | np.ndarray,
+) -> np.ndarray:
+    """Convert a batch of frequency changes to 64-bit integers.
+
+    Changes that are not integers, or do not fit in 64 bits, are rejected
+    rather than truncated.
+    """
+
+    if isinstance(frequency_changes, np.ndarray):
+        changes = frequency_changes
+    else:
+        changes = np.array(list(frequency_changes))
+        if len(changes) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+    if changes.dtype.kind not in "iu" or not np.can_cast(changes.dtype, np.int64):
+        raise TypeError(f"Frequency changes must be 64-bit integers: {changes.dtype}")
+
+    return changes.astype(np.int64, copy=False)
+
+
+def merge_sorted_runs(run: np.ndarray, other_run: np.ndarray) -> np.ndarray:
+    """Merge two sorted runs into one in linear time."""
+
+    # NOTE: A stable sort of 64-bit integers is a timsort, which finds the two
+    # sorted runs in the concatenation and merges them in a single pass.
+    return np.sort(np.concatenate((run, other_run)), kind="stable")
+
+
+def find_first_repeat_frequency_incremental(
+    frequencies: list[int] | np.ndarray,
+) -> int:
+    """Find the first frequency that appears twice by repeatedly calibrating."""
+
+    if len(frequencies) == 0:
+        raise ValueError("No frequency repeated.")
+
+    changes = np.asarray(frequencies, dtype=np.int64)
+    calibrator = FrequencyCalibrator()
+
+    while calibrator.extend(changes) is None:
+        pass
+
+    return calibrator.first_repeat_frequency
+
+
 def main() -> None:
     """Read frequencies from a file and process them."""
 
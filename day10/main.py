@@ -5,8 +5,12 @@ https://adventofcode.com/2018/day/10
 """
 
 import re
+import sys
+from collections.abc import Iterator
 from os import path
-from typing import NamedTuple
+from typing import NamedTuple, TextIO
+
+import numpy as np
 
 INPUT_FILE = "input.txt"
 TEST_FILE = "test.txt"
@@ -39,6 +43,19 @@ class BoundingBox(NamedTuple):
 
 Grid = list[list[str]]
 
+MESSAGE_SEARCH_BATCH_BYTES = 256 * 1024 * 1024
+MAX_RENDER_WIDTH = 200
+
+LIT_CELL = ord("#")
+DARK_CELL = ord(".")
+
+
+class PointArrays(NamedTuple):
+    """Points of light stored as (n x 2) arrays of positions and velocities."""
+
+    positions: np.ndarray
+    velocities: np.ndarray
+
 
 def read_point_data(file_path: str) -> list[Point]:
     """Read point data from a file."""
@@ -107,6 +124,119 @@ def get_grid_and_time_for_message(points: list[Point]) -> tuple[Grid, int]:
     return create_points_grid(current_points), elapsed_time
 
 
+def create_point_arrays(points: list[Point]) -> PointArrays:
+    """Convert points of light into position and velocity arrays."""
+
+    positions = np.array([point.position for point in points], dtype=np.int64)
+    velocities = np.array([point.velocity for point in points], dtype=np.int64)
+
+    return PointArrays(positions.reshape(-1, 2), velocities.reshape(-1, 2))
+
+
+class Frame(NamedTuple):
+    """The rendered rows of the sky at a moment in time."""
+
+    time: int
+    rows: Iterator[str]
+
+
+def advance_point_arrays(point_arrays: PointArrays, seconds: int = 1) -> np.ndarray:
+    """Determine the positions of all points after a number of seconds."""
+
+    positions, velocities = point_arrays
+
+    return positions + velocities * seconds
+
+
+def estimate_message_time(point_arrays: PointArrays) -> int:
+    """Estimate the time at which the points converge.
+
+    Along each axis, the fastest and slowest points close the gap between them
+    at the difference of their velocities, so the spread vanishes roughly when
+    that gap has been covered.
+    """
+
+    positions, velocities = point_arrays
+
+    estimates = []
+    for axis in range(2):
+        fastest = np.argmax(velocities[:, axis])
+        slowest = np.argmin(velocities[:, axis])
+
+        relative_velocity = velocities[fastest, axis] - velocities[slowest, axis]
+        if relative_velocity == 0:
+            continue
+
+        gap = positions[slowest, axis] - positions[fastest, axis]
+        estimates.append(int(gap) // int(relative_velocity))
+
+    return max(0, min(estimates, default=0))
+
+
+def find_tightest_time(
+    point_arrays: PointArrays,
+    times: range,
+    batch_bytes: int = MESSAGE_SEARCH_BATCH_BYTES,
+) -> int:
+    """Find the time within a window at which the bounding box is smallest.
+
+    Candidate times are evaluated together as (t x n x 2) batches, sized so
+    that each batch stays within the given number of bytes.
+    """
+
+    positions, velocities = point_arrays
+
+    # NOTE: Each candidate time needs both its displacements and the positions
+    # they produce, so it takes up twice the size of the positions at once.
+    bytes_per_time = max(1, 2 * positions.nbytes)
+    batch_size = max(1, batch_bytes // bytes_per_time)
+
+    best_time = times[0]
+    best_area = None
+
+    for batch_start in range(0, len(times), batch_size):
+        batch_times = np.asarray(times[batch_start : batch_start + batch_size])
+
+        batch_positions = (
+            positions[np.newaxis, :, :]
+            + batch_times[:, np.newaxis, np.newaxis] * velocities[np.newaxis, :, :]
+        )
+        extents = batch_positions.max(axis=1) - batch_positions.min(axis=1)
+        areas = extents[:, 0] * extents[:, 1]
+
+        batch_best = int(np.argmin(areas))
+        if best_area is None or areas[batch_best] < best_area:
+            best_area = areas[batch_best]
+            best_time = int(batch_times[batch_best])
+
+        # NOTE: The batch is released before the next one is built, so that
+        # only one batch is held at a time.
+        del batch_positions, extents, areas
+
+    return best_time
+
+
+def find_message_time(point_arrays: PointArrays, window: int = 10) -> int:
+    """Determine the time at which the points form the tightest frame.
+
+    The search scans a window of candidate times around an estimate, and slides
+    the window whenever the tightest frame lies on one of its edges.
+    """
+
+    center = estimate_message_time(point_arrays)
+
+    while True:
+        start = max(0, center - window)
+        times = range(start, center + window + 1)
+
+        best_time = find_tightest_time(point_arrays, times)
+        if best_time == times[-1] or (best_time == times[0] and start > 0):
+            center = best_time
+            continue
+
+        return best_time
+
+
 def create_points_grid(points: list[Point]) -> Grid:
     """Create a grid with points of light."""
 
@@ -132,6 +262,62 @@ def print_grid(grid: Grid) -> None:
         print("".join(row))
 
 
+def render_positions(
+    positions: np.ndarray,
+    max_width: int = MAX_RENDER_WIDTH,
+) -> Iterator[str]:
+    """Render the occupied rows of the sky one at a time.
+
+    Points are sorted by row and column so that each occupied row is built from
+    its own slice of coordinates. Empty rows are skipped and rows are cut off at
+    the maximum width, so memory stays proportional to the number of points
+    rather than the area of the bounding box.
+    """
+
+    if len(positions) == 0:
+        return
+
+    min_x, min_y = positions.min(axis=0)
+    max_x = positions[:, 0].max()
+    width = int(min(max_x - min_x + 1, max_width))
+
+    order = np.lexsort((positions[:, 0], positions[:, 1]))
+    xs = positions[order, 0] - min_x
+    ys = positions[order, 1] - min_y
+
+    row_starts = np.flatnonzero(np.diff(ys, prepend=-1))
+    row_ends = np.append(row_starts[1:], len(ys))
+
+    for start, end in zip(row_starts.tolist(), row_ends.tolist()):
+        row_xs = xs[start:end]
+
+        row = np.full(width, DARK_CELL, dtype=np.uint8)
+        row[row_xs[row_xs < width]] = LIT_CELL
+
+        yield row.tobytes().decode("ascii")
+
+
+def write_rows(rows: Iterator[str], file: TextIO = sys.stdout) -> None:
+    """Write rendered rows to a file."""
+
+    for row in rows:
+        file.write(row)
+        file.write("\n")
+
+
+def stream_frames(
+    point_arrays: PointArrays,
+    center_time: int,
+    radius: int = 2,
+    max_width: int = MAX_RENDER_WIDTH,
+) -> Iterator[Frame]:
+    """Lazily render frames for a window of times around a central time."""
+
+    for time in range(max(0, center_time - radius), center_time + radius + 1):
+        positions = advance_point_arrays(point_arrays, time)
+        yield Frame(time, render_positions(positions, max_width))
+
+
 def main() -> None:
     """Read information about moving points of light and process them."""
 
@@ -139,10 +325,12 @@ def main() -> None:
     file_path = path.join(path.dirname(__file__), input_file)
 
     points = read_point_data(file_path)
+    point_arrays = create_point_arrays(points)
 
-    message_grid, message_time = get_grid_and_time_for_message(points)
+    message_time = find_message_time(point_arrays)
+    message_positions = advance_point_arrays(point_arrays, message_time)
     print("The message that will appear in the sky is:")
-    print_grid(message_grid)
+    write_rows(render_positions(message_positions))
     print(f"The message will appear after {message_time} seconds.")
 
 
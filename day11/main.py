@@ -4,9 +4,17 @@ Chronal Charge
 https://adventofcode.com/2018/day/11
 """
 
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
 from itertools import product
+from multiprocessing.shared_memory import SharedMemory
+from os import cpu_count, getpid, makedirs, path, replace
 from typing import NamedTuple
 
+import numpy as np
+
 INPUT_SERIAL_NUMBER = 9110
 TEST_SERIAL_NUMBER_1 = 8
 TEST_SERIAL_NUMBER_2 = 18
@@ -15,6 +23,13 @@ TEST_SERIAL_NUMBER_3 = 42
 GRID_HEIGHT = 300
 GRID_WIDTH = 300
 
+POWER_GRID_CACHE_SIZE = 32
+DEFAULT_BATCH_MEMORY_BYTES = 512 * 1024 * 1024
+DEFAULT_TILE_SIZE = 1024
+
+MAX_POWER_LEVEL = 4
+MAX_UPPER_BOUND_PARTS = 8
+
 
 class Position(NamedTuple):
     """Represents a position on the grid."""
@@ -30,8 +45,35 @@ class SubgridIdentifier(NamedTuple):
     side_length: int
 
 
+class SerialNumberResult(NamedTuple):
+    """The largest power subgrid found for a serial number."""
+
+    serial_number: int
+    subgrid_identifier: SubgridIdentifier
+    total_power: int
+
+
+class TiledPowerGrid(NamedTuple):
+    """A power grid and its summed-area table stored in memory-mapped files."""
+
+    power_levels: np.ndarray
+    table: np.ndarray
+
+
 PowerGrid = list[list[int]]
 
+# NOTE: A summed-area table has one more row and column than its grid, where
+# the entry at [y, x] holds the total power of all cells above and to the left
+# of (x, y). The first row and column are zero.
+SummedAreaTable = np.ndarray
+
+
+def read_serial_number(file_path: str) -> int:
+    """Read a grid serial number from a file."""
+
+    with open(file_path, encoding="utf-8") as file:
+        return int(file.read().strip())
+
 
 def get_power_level(fuel_cell_position: Position, serial_number: int) -> int:
     """Get the power level of a cell."""
@@ -51,16 +93,91 @@ def get_power_level(fuel_cell_position: Position, serial_number: int) -> int:
     return power_level
 
 
-def create_power_grid(serial_number: int) -> PowerGrid:
-    """Create a 300x300 power grid."""
+def create_power_grid(
+    serial_number: int,
+    width: int = GRID_WIDTH,
+    height: int = GRID_HEIGHT,
+) -> PowerGrid:
+    """Create a power grid, 300x300 by default."""
 
-    grid = [[0] * GRID_WIDTH for _ in range(GRID_HEIGHT)]
+    return get_power_grid_array(serial_number, width, height).tolist()
 
-    x_range = range(GRID_WIDTH)
-    y_range = range(GRID_HEIGHT)
 
-    for x, y in product(x_range, y_range):
-        grid[y][x] = get_power_level(Position(x, y), serial_number)
+def compute_power_grid_array(
+    serial_number: int,
+    width: int = GRID_WIDTH,
+    height: int = GRID_HEIGHT,
+) -> np.ndarray:
+    """Compute the power level of every cell at once, indexed by [y, x]."""
+
+    return compute_power_grid_batch(np.array([serial_number]), width, height)[0]
+
+
+def compute_power_grid_batch(
+    serial_numbers: np.ndarray,
+    width: int = GRID_WIDTH,
+    height: int = GRID_HEIGHT,
+    x_start: int = 0,
+    y_start: int = 0,
+) -> np.ndarray:
+    """Compute power grids for many serial numbers, indexed by [serial, y, x].
+
+    The start coordinates allow computing a single tile of a larger grid.
+    """
+
+    serial_number = np.asarray(serial_numbers, dtype=np.int64)[:, None, None]
+    x = np.arange(x_start, x_start + width, dtype=np.int64)[None, None, :]
+    y = np.arange(y_start, y_start + height, dtype=np.int64)[None, :, None]
+
+    rack_id = x + 10
+
+    power_level = rack_id * y
+    power_level = power_level + serial_number
+    power_level *= rack_id
+
+    # NOTE: The remaining steps work in place, so a batch of grids only ever
+    # holds one int64 array of its size.
+    power_level //= 100
+    power_level %= 10
+    power_level -= 5
+
+    return power_level.astype(np.int8)
+
+
+@lru_cache(maxsize=POWER_GRID_CACHE_SIZE)
+def get_power_grid_array(
+    serial_number: int,
+    width: int = GRID_WIDTH,
+    height: int = GRID_HEIGHT,
+    cache_dir: str | None = None,
+) -> np.ndarray:
+    """Get the power grid for a serial number, computing it only once.
+
+    Grids are kept in memory for repeated queries. When a cache directory is
+    given, grids are also saved there as .npy files and loaded on later runs.
+    The returned array is read-only because it is shared between callers.
+    """
+
+    file_path = None
+    if cache_dir is not None:
+        file_path = path.join(
+            cache_dir,
+            f"power_grid_{serial_number}_{width}x{height}.npy",
+        )
+
+    if file_path is not None and path.exists(file_path):
+        grid = np.load(file_path)
+    else:
+        grid = compute_power_grid_array(serial_number, width, height)
+
+        if file_path is not None:
+            makedirs(cache_dir, exist_ok=True)
+
+            partial_file_path = f"{file_path}.{getpid()}.partial.npy"
+            np.save(partial_file_path, grid)
+            replace(partial_file_path, file_path)
+
+    grid.flags.writeable = False
 
     return grid
 
@@ -87,8 +204,8 @@ def get_total_power_of_subgrid(
 def find_largest_power_3_by_3_subgrid(grid: PowerGrid) -> SubgridIdentifier:
     """Find the 3 by 3 subgrid with the largest total power."""
 
-    x_range = range(0, GRID_WIDTH - 2)
-    y_range = range(0, GRID_HEIGHT - 2)
+    x_range = range(0, len(grid[0]) - 2)
+    y_range = range(0, len(grid) - 2)
 
     max_power_level = float("-inf")
     largest_subgrid_identifier = SubgridIdentifier(Position(0, 0), 1)
@@ -106,6 +223,508 @@ def find_largest_power_3_by_3_subgrid(grid: PowerGrid) -> SubgridIdentifier:
     return largest_subgrid_identifier
 
 
+def create_summed_area_table(grid: PowerGrid | np.ndarray) -> SummedAreaTable:
+    """Create a summed-area table for a power grid."""
+
+    power_levels = np.asarray(grid, dtype=np.int64)
+    height, width = power_levels.shape
+
+    table = np.zeros((height + 1, width + 1), dtype=np.int64)
+    table[1:, 1:] = power_levels.cumsum(axis=0).cumsum(axis=1)
+
+    return table
+
+
+def get_total_power_from_table(
+    table: SummedAreaTable,
+    subgrid_identifier: SubgridIdentifier,
+) -> int:
+    """Get the total power of a subgrid in constant time."""
+
+    (x, y), side_length = subgrid_identifier
+
+    total_power = (
+        table[y + side_length, x + side_length]
+        - table[y, x + side_length]
+        - table[y + side_length, x]
+        + table[y, x]
+    )
+
+    return int(total_power)
+
+
+def create_summed_area_table_batch(grids: np.ndarray) -> np.ndarray:
+    """Create summed-area tables for a stack of power grids."""
+
+    count, height, width = grids.shape
+
+    tables = np.zeros((count, height + 1, width + 1), dtype=np.int64)
+    np.cumsum(grids, axis=1, dtype=np.int64, out=tables[:, 1:, 1:])
+    np.cumsum(tables[:, 1:, 1:], axis=2, out=tables[:, 1:, 1:])
+
+    return tables
+
+
+def get_subgrid_powers(table: SummedAreaTable, side_length: int) -> np.ndarray:
+    """Get the total power of every subgrid with a side length, indexed by [y, x].
+
+    Leading axes are preserved, so a stack of tables gives a stack of results.
+    """
+
+    return (
+        table[..., side_length:, side_length:]
+        - table[..., :-side_length, side_length:]
+        - table[..., side_length:, :-side_length]
+        + table[..., :-side_length, :-side_length]
+    )
+
+
+def find_largest_power_subgrid_of_size(
+    table: SummedAreaTable,
+    side_length: int,
+) -> tuple[SubgridIdentifier, int]:
+    """Find the subgrid with a side length that has the largest total power.
+
+    Ties are broken in favor of the smallest x coordinate, then the smallest y.
+    """
+
+    # NOTE: Transposing the window sums makes the flat index x-major, so the
+    # first maximum found is the one with the smallest (x, y) coordinate.
+    subgrid_powers = get_subgrid_powers(table, side_length).T
+
+    flat_index = int(np.argmax(subgrid_powers))
+    x, y = np.unravel_index(flat_index, subgrid_powers.shape)
+
+    subgrid_identifier = SubgridIdentifier(Position(int(x), int(y)), side_length)
+
+    return subgrid_identifier, int(subgrid_powers[x, y])
+
+
+def get_side_lengths(
+    sizes: Iterable[int] | None,
+    width: int,
+    height: int,
+) -> list[int]:
+    """Get the sorted side lengths to search that fit in a grid."""
+
+    if sizes is None:
+        sizes = range(1, min(width, height) + 1)
+
+    return [size for size in sorted(sizes) if 1 <= size <= min(width, height)]
+
+
+def find_largest_power_subgrid(
+    grid: PowerGrid | np.ndarray,
+    sizes: Iterable[int] | None = None,
+) -> SubgridIdentifier:
+    """Find the subgrid of any of the given sizes with the largest total power.
+
+    All sizes that fit in the grid are searched by default. Ties are broken in
+    favor of the smallest side length.
+    """
+
+    table = create_summed_area_table(grid)
+    height, width = table.shape[0] - 1, table.shape[1] - 1
+
+    max_power_level = float("-inf")
+    largest_subgrid_identifier = SubgridIdentifier(Position(0, 0), 1)
+
+    for side_length in get_side_lengths(sizes, width, height):
+        subgrid_identifier, power_level = find_largest_power_subgrid_of_size(
+            table,
+            side_length,
+        )
+        if power_level <= max_power_level:
+            continue
+
+        max_power_level = power_level
+        largest_subgrid_identifier = subgrid_identifier
+
+    return largest_subgrid_identifier
+
+
+def find_largest_power_subgrids_for_serial_numbers(
+    serial_numbers: Iterable[int],
+    sizes: Iterable[int] | None = None,
+    width: int = GRID_WIDTH,
+    height: int = GRID_HEIGHT,
+    memory_budget: int = DEFAULT_BATCH_MEMORY_BYTES,
+) -> list[SerialNumberResult]:
+    """Find the largest power subgrid for each of many serial numbers.
+
+    Serial numbers are processed in chunks whose grids, summed-area tables and
+    window sums fit within the memory budget. Ties are broken the same way as
+    in find_largest_power_subgrid.
+    """
+
+    serial_numbers = np.asarray(list(serial_numbers), dtype=np.int64)
+    side_lengths = get_side_lengths(sizes, width, height)
+
+    # NOTE: At its peak, each serial number holds its grid plus three int64
+    # arrays of the table's size: the table, the window sums and either their
+    # temporary or their flattened copy. This matches the measured peak.
+    bytes_per_serial_number = width * height + 3 * 8 * (width + 1) * (height + 1)
+    chunk_size = max(1, memory_budget // bytes_per_serial_number)
+
+    results = []
+
+    for chunk_start in range(0, len(serial_numbers), chunk_size):
+        chunk = serial_numbers[chunk_start : chunk_start + chunk_size]
+
+        tables = create_summed_area_table_batch(
+            compute_power_grid_batch(chunk, width, height),
+        )
+
+        best_powers = np.full(len(chunk), np.iinfo(np.int64).min)
+        best_x = np.zeros(len(chunk), dtype=np.int64)
+        best_y = np.zeros(len(chunk), dtype=np.int64)
+        best_side_lengths = np.ones(len(chunk), dtype=np.int64)
+
+        for side_length in side_lengths:
+            subgrid_powers = get_subgrid_powers(tables, side_length).transpose(0, 2, 1)
+            flat_powers = subgrid_powers.reshape(len(chunk), -1)
+
+            flat_indices = np.argmax(flat_powers, axis=1)
+            powers = flat_powers[np.arange(len(chunk)), flat_indices]
+            x, y = np.unravel_index(flat_indices, subgrid_powers.shape[1:])
+
+            improved = powers > best_powers
+            best_powers[improved] = powers[improved]
+            best_x[improved] = x[improved]
+            best_y[improved] = y[improved]
+            best_side_lengths[improved] = side_length
+
+            del subgrid_powers, flat_powers
+
+        del tables
+
+        for index, serial_number in enumerate(chunk.tolist()):
+            subgrid_identifier = SubgridIdentifier(
+                Position(int(best_x[index]), int(best_y[index])),
+                int(best_side_lengths[index]),
+            )
+            results.append(
+                SerialNumberResult(
+                    serial_number,
+                    subgrid_identifier,
+                    int(best_powers[index]),
+                ),
+            )
+
+    return results
+
+
+def get_tiled_power_grid(
+    serial_number: int,
+    width: int,
+    height: int,
+    directory: str,
+    tile_size: int = DEFAULT_TILE_SIZE,
+) -> TiledPowerGrid:
+    """Get a power grid and its summed-area table as memory-mapped files.
+
+    Existing files in the directory are reused. Otherwise, power levels are
+    stored as int8 and the summed-area table as int64, both computed one tile at
+    a time so that only a few tiles are ever held in memory. Files are built
+    under temporary names and only renamed once complete, so an interrupted
+    build is never mistaken for a finished one.
+    """
+
+    stem = f"power_grid_{serial_number}_{width}x{height}"
+    power_levels_path = path.join(directory, f"{stem}.npy")
+    table_path = path.join(directory, f"{stem}_table.npy")
+
+    if not (path.exists(power_levels_path) and path.exists(table_path)):
+        makedirs(directory, exist_ok=True)
+
+        partial_stem = f"{stem}.{getpid()}.partial"
+        partial_power_levels_path = path.join(directory, f"{partial_stem}.npy")
+        partial_table_path = path.join(directory, f"{partial_stem}_table.npy")
+
+        power_levels = np.lib.format.open_memmap(
+            partial_power_levels_path,
+            mode="w+",
+            dtype=np.int8,
+            shape=(height, width),
+        )
+        table = np.lib.format.open_memmap(
+            partial_table_path,
+            mode="w+",
+            dtype=np.int64,
+            shape=(height + 1, width + 1),
+        )
+        table[0, :] = 0
+        table[:, 0] = 0
+
+        # NOTE: Tiles are filled in row-major order, so the table row above and
+        # the table column to the left of each tile are already complete. They
+        # extend the tile's local cumulative sums to the whole grid.
+        for y_start, y_end, x_start, x_end in get_tiles(width, height, tile_size):
+            tile = compute_power_grid_batch(
+                np.array([serial_number]),
+                x_end - x_start,
+                y_end - y_start,
+                x_start,
+                y_start,
+            )[0]
+            power_levels[y_start:y_end, x_start:x_end] = tile
+
+            local_table = tile.cumsum(axis=0, dtype=np.int64).cumsum(axis=1)
+            table[y_start + 1 : y_end + 1, x_start + 1 : x_end + 1] = (
+                local_table
+                + table[y_start, x_start + 1 : x_end + 1][np.newaxis, :]
+                + table[y_start + 1 : y_end + 1, x_start][:, np.newaxis]
+                - table[y_start, x_start]
+            )
+
+        power_levels.flush()
+        table.flush()
+        del power_levels, table
+
+        # NOTE: The table is renamed last, as its presence alongside the power
+        # levels is what marks a grid as complete.
+        replace(partial_power_levels_path, power_levels_path)
+        replace(partial_table_path, table_path)
+
+    return TiledPowerGrid(
+        np.load(power_levels_path, mmap_mode="r"),
+        np.load(table_path, mmap_mode="r"),
+    )
+
+
+def get_tiles(
+    width: int,
+    height: int,
+    tile_size: int,
+) -> Iterable[tuple[int, int, int, int]]:
+    """Split a grid into tiles, given as (y_start, y_end, x_start, x_end)."""
+
+    for y_start in range(0, height, tile_size):
+        for x_start in range(0, width, tile_size):
+            yield (
+                y_start,
+                min(y_start + tile_size, height),
+                x_start,
+                min(x_start + tile_size, width),
+            )
+
+
+def find_largest_power_subgrid_of_size_tiled(
+    table: SummedAreaTable,
+    side_length: int,
+    tile_size: int = DEFAULT_TILE_SIZE,
+) -> tuple[SubgridIdentifier, int]:
+    """Find the subgrid with a side length that has the largest total power.
+
+    The table is read one tile of top-left corners at a time. Each tile needs
+    the table entries at its own corners and at the corners offset by the side
+    length, so four tile-sized blocks are read however large the subgrid is.
+    Ties are broken as in find_largest_power_subgrid_of_size.
+    """
+
+    height, width = table.shape[0] - 1, table.shape[1] - 1
+    corner_width = width - side_length + 1
+    corner_height = height - side_length + 1
+
+    best_key = None
+    best_result = (SubgridIdentifier(Position(0, 0), side_length), 0)
+
+    tiles = get_tiles(corner_width, corner_height, tile_size)
+    for y_start, y_end, x_start, x_end in tiles:
+        top = slice(y_start, y_end)
+        bottom = slice(y_start + side_length, y_end + side_length)
+        left = slice(x_start, x_end)
+        right = slice(x_start + side_length, x_end + side_length)
+
+        subgrid_powers = (
+            np.asarray(table[bottom, right])
+            - table[top, right]
+            - table[bottom, left]
+            + table[top, left]
+        ).T
+
+        flat_index = int(np.argmax(subgrid_powers))
+        dx, dy = np.unravel_index(flat_index, subgrid_powers.shape)
+        power_level = int(subgrid_powers[dx, dy])
+        x, y = x_start + int(dx), y_start + int(dy)
+
+        key = (-power_level, x, y)
+        if best_key is not None and key >= best_key:
+            continue
+
+        best_key = key
+        best_result = (SubgridIdentifier(Position(x, y), side_length), power_level)
+
+    return best_result
+
+
+def find_largest_power_subgrid_tiled(
+    tiled_grid: TiledPowerGrid,
+    sizes: Iterable[int] | None = None,
+    tile_size: int = DEFAULT_TILE_SIZE,
+) -> SubgridIdentifier:
+    """Find the largest power subgrid of a memory-mapped grid.
+
+    The result matches find_largest_power_subgrid on the same grid.
+    """
+
+    table = tiled_grid.table
+    height, width = table.shape[0] - 1, table.shape[1] - 1
+
+    max_power_level = float("-inf")
+    largest_subgrid_identifier = SubgridIdentifier(Position(0, 0), 1)
+
+    for side_length in get_side_lengths(sizes, width, height):
+        subgrid_identifier, power_level = find_largest_power_subgrid_of_size_tiled(
+            table,
+            side_length,
+            tile_size,
+        )
+        if power_level <= max_power_level:
+            continue
+
+        max_power_level = power_level
+        largest_subgrid_identifier = subgrid_identifier
+
+    return largest_subgrid_identifier
+
+
+def get_power_upper_bound(side_length: int, best_powers: dict[int, int]) -> int:
+    """Bound the total power of any subgrid with a side length.
+
+    A subgrid can be split into q by q smaller subgrids of side m = s // q,
+    none of which can exceed the best total found for side m, plus a border of
+    leftover cells that hold at most the maximum power level each.
+    """
+
+    upper_bound = MAX_POWER_LEVEL * side_length * side_length
+
+    for part_count in range(2, MAX_UPPER_BOUND_PARTS + 1):
+        part_side_length = side_length // part_count
+        if part_side_length not in best_powers:
+            continue
+
+        covered_side_length = part_count * part_side_length
+        border_cell_count = side_length**2 - covered_side_length**2
+
+        upper_bound = min(
+            upper_bound,
+            part_count**2 * best_powers[part_side_length]
+            + MAX_POWER_LEVEL * border_cell_count,
+        )
+
+    return upper_bound
+
+
+_shared_memory: SharedMemory | None = None
+_shared_table: SummedAreaTable | None = None
+
+
+def _attach_shared_table(shared_memory_name: str, shape: tuple[int, int]) -> None:
+    """Attach a worker process to a summed-area table in shared memory."""
+
+    global _shared_memory, _shared_table
+
+    # NOTE: The shared memory handle is kept in a global because the table's
+    # buffer is only valid for as long as the handle stays open.
+    _shared_memory = SharedMemory(name=shared_memory_name)
+
+    _shared_table = np.ndarray(shape, dtype=np.int64, buffer=_shared_memory.buf)
+    _shared_table.flags.writeable = False
+
+
+def _find_largest_power_subgrid_of_size_shared(
+    side_length: int,
+) -> tuple[SubgridIdentifier, int]:
+    """Find the largest power subgrid of a size in the shared summed-area table."""
+
+    return find_largest_power_subgrid_of_size(_shared_table, side_length)
+
+
+def find_largest_power_subgrid_parallel(
+    grid: PowerGrid | np.ndarray,
+    sizes: Iterable[int] | None = None,
+    max_workers: int | None = None,
+) -> SubgridIdentifier:
+    """Find the largest power subgrid by searching sizes in a process pool.
+
+    Worker processes share one read-only summed-area table. Sizes are
+    dispatched in ascending order, and a size is skipped when its upper bound,
+    derived from the smaller sizes already searched, cannot beat the best
+    total found so far. The result matches find_largest_power_subgrid.
+    """
+
+    table = create_summed_area_table(grid)
+    height, width = table.shape[0] - 1, table.shape[1] - 1
+
+    if max_workers is None:
+        max_workers = cpu_count() or 1
+
+    max_pending = 2 * max_workers
+
+    shared_memory = SharedMemory(create=True, size=table.nbytes)
+
+    try:
+        shared_table = np.ndarray(
+            table.shape,
+            dtype=np.int64,
+            buffer=shared_memory.buf,
+        )
+        shared_table[:] = table
+        del shared_table
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_attach_shared_table,
+            initargs=(shared_memory.name, table.shape),
+        ) as executor:
+            remaining_side_lengths = deque(get_side_lengths(sizes, width, height))
+            pending_side_lengths = {}
+            best_powers: dict[int, int] = {}
+
+            max_power_level = float("-inf")
+            largest_subgrid_key = (float("inf"), 0)
+            largest_subgrid_identifier = SubgridIdentifier(Position(0, 0), 1)
+
+            while remaining_side_lengths or pending_side_lengths:
+                while (
+                    remaining_side_lengths and len(pending_side_lengths) < max_pending
+                ):
+                    side_length = remaining_side_lengths.popleft()
+
+                    upper_bound = get_power_upper_bound(side_length, best_powers)
+                    if upper_bound <= max_power_level:
+                        continue
+
+                    future = executor.submit(
+                        _find_largest_power_subgrid_of_size_shared,
+                        side_length,
+                    )
+                    pending_side_lengths[future] = side_length
+
+                completed, _ = wait(pending_side_lengths, return_when=FIRST_COMPLETED)
+
+                for future in completed:
+                    side_length = pending_side_lengths.pop(future)
+                    subgrid_identifier, power_level = future.result()
+                    best_powers[side_length] = power_level
+
+                    # NOTE: Sizes may finish out of order, so ties are resolved
+                    # explicitly in favor of the smallest side length.
+                    key = (-power_level, side_length)
+                    if key >= largest_subgrid_key:
+                        continue
+
+                    max_power_level = power_level
+                    largest_subgrid_key = key
+                    largest_subgrid_identifier = subgrid_identifier
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+    return largest_subgrid_identifier
+
+
 def main() -> None:
     """Process data about the power grid using the given serial number."""
 
@@ -116,6 +735,9 @@ def main() -> None:
     largest_3_by_3_subgrid = find_largest_power_3_by_3_subgrid(power_grid)
     print(largest_3_by_3_subgrid)
 
+    largest_subgrid = find_largest_power_subgrid(get_power_grid_array(serial_number))
+    print(largest_subgrid)
+
 
 if __name__ == "__main__":
     main()
@@ -4,14 +4,36 @@ Inventory Management System
 https://adventofcode.com/2018/day/2
 """
 
-from collections import Counter
-from itertools import pairwise
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import combinations, pairwise, repeat
+from math import ceil
 from os import path
+from tempfile import TemporaryDirectory
+from typing import NamedTuple
+from zlib import crc32
 
 INPUT_FILE = "input.txt"
 TEST_FILE_1 = "test1.txt"
 TEST_FILE_2 = "test2.txt"
 
+DEFAULT_BUCKET_COUNT = 64
+DEFAULT_WORKER_MEMORY_BYTES = 256 * 1024 * 1024
+MASK_CHARACTER = "_"
+
+# NOTE: Searching a bucket keeps each of its lines in a dictionary of sets,
+# which takes about this many bytes of memory per byte of bucket file.
+BUCKET_MEMORY_FACTOR = 10
+
+
+class LetterRepetitionCounts(NamedTuple):
+    """The number of box IDs with a letter appearing exactly twice or thrice."""
+
+    two_frequency_count: int
+    three_frequency_count: int
+
 
 def read_box_ids(file_path: str) -> list[str]:
     """Read box ids from a file."""
@@ -20,9 +42,17 @@ def read_box_ids(file_path: str) -> list[str]:
         return [line.strip() for line in file]
 
 
-def checksum(box_ids: str) -> int:
+def checksum(box_ids: Iterable[str]) -> int:
     """Calculate the checksum of a collection of box ids."""
 
+    two_frequency_count, three_frequency_count = count_letter_repetitions(box_ids)
+
+    return two_frequency_count * three_frequency_count
+
+
+def count_letter_repetitions(box_ids: Iterable[str]) -> LetterRepetitionCounts:
+    """Count the box IDs with a letter appearing exactly twice or thrice."""
+
     two_frequency_count = 0
     three_frequency_count = 0
 
@@ -37,6 +67,38 @@ def checksum(box_ids: str) -> int:
         if has_three_frequency > 0:
             three_frequency_count += 1
 
+    return LetterRepetitionCounts(two_frequency_count, three_frequency_count)
+
+
+def stream_box_ids(file_path: str) -> Iterator[str]:
+    """Stream box ids from a file one at a time."""
+
+    with open(file_path, encoding="utf-8") as file:
+        for line in file:
+            box_id = line.strip()
+            if box_id:
+                yield box_id
+
+
+def count_shard_letter_repetitions(shard_path: str) -> LetterRepetitionCounts:
+    """Count the letter repetitions of the box IDs in a shard."""
+
+    return count_letter_repetitions(stream_box_ids(shard_path))
+
+
+def checksum_sharded(shard_paths: list[str], max_workers: int | None = None) -> int:
+    """Calculate the checksum of box IDs split across shard files.
+
+    Each shard is streamed by a worker process, and the counts of the shards
+    are added up before they are multiplied.
+    """
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        shard_counts = list(executor.map(count_shard_letter_repetitions, shard_paths))
+
+    two_frequency_count = sum(counts.two_frequency_count for counts in shard_counts)
+    three_frequency_count = sum(counts.three_frequency_count for counts in shard_counts)
+
     return two_frequency_count * three_frequency_count
 
 
@@ -83,6 +145,156 @@ def get_common_letters(box_id1: str, box_id2: str) -> list[str]:
     return [letter1 for letter1, letter2 in zip(box_id1, box_id2) if letter1 == letter2]
 
 
+def get_masked_keys(box_id: str) -> Iterator[tuple[int, str]]:
+    """Get the keys of a box ID with each position masked in turn.
+
+    Two box IDs differ by exactly one character if and only if they share a
+    masked key but are not equal.
+    """
+
+    for position in range(len(box_id)):
+        yield position, box_id[:position] + MASK_CHARACTER + box_id[position + 1 :]
+
+
+def get_masked_key_hash(position: int | str, masked_key: str) -> int:
+    """Hash a masked key together with its masked position."""
+
+    return crc32(f"{position}:{masked_key}".encode())
+
+
+def get_bucket(position: int, masked_key: str, bucket_count: int) -> int:
+    """Determine the bucket that a masked key is partitioned into."""
+
+    return get_masked_key_hash(position, masked_key) % bucket_count
+
+
+def get_pass_count(bucket_paths: list[str], worker_memory_bytes: int) -> int:
+    """Determine how many passes searching a bucket takes to fit in memory."""
+
+    bucket_bytes = sum(path.getsize(bucket_path) for bucket_path in bucket_paths)
+
+    return max(1, ceil(bucket_bytes * BUCKET_MEMORY_FACTOR / worker_memory_bytes))
+
+
+def get_bucket_path(directory: str, bucket: int, shard_index: int) -> str:
+    """Get the path of the part of a bucket written for a shard."""
+
+    return path.join(directory, f"bucket-{bucket}-shard-{shard_index}.txt")
+
+
+def partition_shard(
+    shard_path: str,
+    shard_index: int,
+    directory: str,
+    bucket_count: int,
+) -> None:
+    """Write every masked key of the box IDs in a shard to its bucket file."""
+
+    with ExitStack() as stack:
+        bucket_files = [
+            stack.enter_context(
+                open(
+                    get_bucket_path(directory, bucket, shard_index),
+                    "w",
+                    encoding="utf-8",
+                ),
+            )
+            for bucket in range(bucket_count)
+        ]
+
+        for box_id in stream_box_ids(shard_path):
+            for position, masked_key in get_masked_keys(box_id):
+                bucket = get_bucket(position, masked_key, bucket_count)
+                bucket_files[bucket].write(f"{position}\t{masked_key}\t{box_id}\n")
+
+
+def find_near_duplicates_in_bucket(
+    bucket_paths: list[str],
+    bucket_count: int = DEFAULT_BUCKET_COUNT,
+    worker_memory_bytes: int = DEFAULT_WORKER_MEMORY_BYTES,
+) -> list[tuple[str, str]]:
+    """Find the pairs of box IDs sharing a masked key within one bucket.
+
+    A bucket too large for the memory budget is searched in several passes,
+    each holding only the masked keys that a second level of hashing assigns
+    to it.
+    """
+
+    pass_count = get_pass_count(bucket_paths, worker_memory_bytes)
+    pairs = []
+
+    for pass_index in range(pass_count):
+        masked_key_box_ids: dict[tuple[str, str], set[str]] = defaultdict(set)
+
+        for bucket_path in bucket_paths:
+            with open(bucket_path, encoding="utf-8") as file:
+                for line in file:
+                    position, masked_key, box_id = line.rstrip("\n").split("\t")
+
+                    # NOTE: The bucket was chosen by the hash modulo the bucket
+                    # count, so the pass is taken from the remaining bits.
+                    if pass_count > 1:
+                        key_hash = get_masked_key_hash(position, masked_key)
+                        if key_hash // bucket_count % pass_count != pass_index:
+                            continue
+
+                    masked_key_box_ids[(position, masked_key)].add(box_id)
+
+        pairs.extend(
+            pair
+            for box_ids in masked_key_box_ids.values()
+            for pair in combinations(sorted(box_ids), 2)
+        )
+
+    return pairs
+
+
+def find_near_duplicate_box_ids_sharded(
+    shard_paths: list[str],
+    bucket_count: int = DEFAULT_BUCKET_COUNT,
+    max_workers: int | None = None,
+    directory: str | None = None,
+    worker_memory_bytes: int = DEFAULT_WORKER_MEMORY_BYTES,
+) -> list[tuple[str, str]]:
+    """Find every pair of box IDs, across all shards, that differ by one character.
+
+    Masked keys are partitioned into buckets by hash, so both IDs of a pair
+    always land in the same bucket. Each bucket is then searched on its own,
+    in as many passes as it takes to stay within the memory budget of a worker.
+    """
+
+    with ExitStack() as stack:
+        if directory is None:
+            directory = stack.enter_context(TemporaryDirectory())
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            list(
+                executor.map(
+                    partition_shard,
+                    shard_paths,
+                    range(len(shard_paths)),
+                    repeat(directory),
+                    repeat(bucket_count),
+                ),
+            )
+
+            bucket_paths = [
+                [
+                    get_bucket_path(directory, bucket, shard_index)
+                    for shard_index in range(len(shard_paths))
+                ]
+                for bucket in range(bucket_count)
+            ]
+            bucket_pairs = executor.map(
+                find_near_duplicates_in_bucket,
+                bucket_paths,
+                repeat(bucket_count),
+                repeat(worker_memory_bytes),
+            )
+
+            return sorted({pair for pairs in bucket_pairs for pair in pairs})
+
+
 def main() -> None:
     """Read box IDs from a file and process them."""
 
@@ -7,15 +7,34 @@ https://adventofcode.com/2018/day/3
 import re
 from collections import defaultdict
 from dataclasses import dataclass
+from io import StringIO
 from itertools import product
 from os import path
 from typing import NamedTuple
 
+import numpy as np
+
 INPUT_FILE = "input.txt"
 TEST_FILE = "test.txt"
 
 CLAIM_REGEX = re.compile(r"#(\d+) @ (\d+),(\d+): (\d+)x(\d+)")
+CLAIM_LINE_REGEX = re.compile(
+    r"^#(\d+) @ (\d+),(\d+): (\d+)x(\d+)\r?$",
+    re.MULTILINE,
+)
 FABRIC_SIDE_LENGTH = 1000
+CLAIM_BLOCK_SIZE = 1024
+
+# NOTE: Claims are stored as 20-byte records, one 32-bit integer per field.
+CLAIM_DTYPE = np.dtype(
+    [
+        ("id", np.int32),
+        ("x", np.int32),
+        ("y", np.int32),
+        ("width", np.int32),
+        ("height", np.int32),
+    ],
+)
 
 
 @dataclass(frozen=True)
@@ -67,6 +86,176 @@ def parse_claim(line: str) -> Claim:
     return Claim(claim_id, x, y, width, height)
 
 
+class Region(NamedTuple):
+    """Represents a rectangular region of fabric."""
+
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+def read_claim_array(file_path: str) -> np.ndarray:
+    """Read claims from a file into a structured array with a column per field."""
+
+    with open(file_path, encoding="utf-8") as file:
+        content = file.read()
+
+    # NOTE: The pattern is anchored to whole lines, so each match is exactly
+    # one line and any line left unmatched is malformed.
+    claims = np.fromregex(StringIO(content), CLAIM_LINE_REGEX, CLAIM_DTYPE)
+
+    lines = content.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+
+    if len(claims) != len(lines):
+        for line in lines:
+            if not CLAIM_LINE_REGEX.match(line):
+                raise ValueError(f"Invalid claim: {line}")
+
+    return claims
+
+
+def get_claim_extent(claims: np.ndarray) -> Region:
+    """Find the smallest region, starting at the origin, that covers every claim."""
+
+    if len(claims) == 0:
+        return Region(0, 0, 0, 0)
+
+    width = int((claims["x"] + claims["width"]).max())
+    height = int((claims["y"] + claims["height"]).max())
+
+    return Region(0, 0, width, height)
+
+
+def get_region_overlap_mask(claims: np.ndarray, region: Region) -> np.ndarray:
+    """Determine which claims overlap a region."""
+
+    return (
+        (claims["x"] < region.x + region.width)
+        & (region.x < claims["x"] + claims["width"])
+        & (claims["y"] < region.y + region.height)
+        & (region.y < claims["y"] + claims["height"])
+    )
+
+
+def filter_claims_by_region(claims: np.ndarray, region: Region) -> np.ndarray:
+    """Select the claims that overlap a region."""
+
+    return claims[get_region_overlap_mask(claims, region)]
+
+
+def get_claim_overlap_matrix(
+    claims: np.ndarray,
+    other_claims: np.ndarray,
+) -> np.ndarray:
+    """Determine which claims overlap which other claims, pair by pair."""
+
+    row_claims = claims[:, np.newaxis]
+
+    return (
+        (row_claims["x"] < other_claims["x"] + other_claims["width"])
+        & (other_claims["x"] < row_claims["x"] + row_claims["width"])
+        & (row_claims["y"] < other_claims["y"] + other_claims["height"])
+        & (other_claims["y"] < row_claims["y"] + row_claims["height"])
+    )
+
+
+def find_overlapping_claim_pairs(
+    claims: np.ndarray,
+    block_size: int = CLAIM_BLOCK_SIZE,
+) -> np.ndarray:
+    """Find the indices of every pair of overlapping claims.
+
+    Claims are compared a tile at a time, one block of claims against one
+    block of later claims, so the pairwise comparison never holds more than
+    a block by block matrix in memory.
+    """
+
+    pairs = []
+
+    for row_start in range(0, len(claims), block_size):
+        row_block = claims[row_start : row_start + block_size]
+
+        for column_start in range(row_start, len(claims), block_size):
+            column_block = claims[column_start : column_start + block_size]
+            overlaps = get_claim_overlap_matrix(row_block, column_block)
+
+            rows, columns = np.nonzero(overlaps)
+            rows += row_start
+            columns += column_start
+            is_later = columns > rows
+
+            pairs.append(np.column_stack((rows[is_later], columns[is_later])))
+
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.intp)
+
+    return np.concatenate(pairs)
+
+
+def get_claim_counts(claims: np.ndarray) -> np.ndarray:
+    """Count the claims covering each square inch of the claimed fabric."""
+
+    extent = get_claim_extent(claims)
+
+    # NOTE: Each claim adds one at its top left corner and cancels itself out
+    # past its other corners, so summing along both axes yields the number of
+    # claims covering each square inch.
+    claim_counts = np.zeros((extent.height + 1, extent.width + 1), dtype=np.int32)
+
+    x_end = claims["x"] + claims["width"]
+    y_end = claims["y"] + claims["height"]
+
+    np.add.at(claim_counts, (claims["y"], claims["x"]), 1)
+    np.add.at(claim_counts, (claims["y"], x_end), -1)
+    np.add.at(claim_counts, (y_end, claims["x"]), -1)
+    np.add.at(claim_counts, (y_end, x_end), 1)
+
+    claim_counts = claim_counts.cumsum(axis=0, dtype=np.int32)
+
+    return claim_counts.cumsum(axis=1, dtype=np.int32)
+
+
+def count_overlapping_square_inches_vectorized(claims: np.ndarray) -> int:
+    """Count the square inches claimed by multiple claims using array operations."""
+
+    return int(np.count_nonzero(get_claim_counts(claims) > 1))
+
+
+def find_non_overlapping_claim_vectorized(claims: np.ndarray) -> np.void:
+    """Find the claim that does not overlap with any other claim using arrays.
+
+    A summed-area table of the square inches claimed more than once gives the
+    number of such square inches inside any claim from its four corners.
+    """
+
+    overlapped = get_claim_counts(claims) > 1
+
+    table = np.zeros(
+        (overlapped.shape[0] + 1, overlapped.shape[1] + 1),
+        dtype=np.int32,
+    )
+    table[1:, 1:] = overlapped.cumsum(axis=0, dtype=np.int32).cumsum(axis=1)
+
+    x_end = claims["x"] + claims["width"]
+    y_end = claims["y"] + claims["height"]
+
+    overlapped_areas = (
+        table[y_end, x_end]
+        - table[claims["y"], x_end]
+        - table[y_end, claims["x"]]
+        + table[claims["y"], claims["x"]]
+    )
+
+    candidates = np.flatnonzero(overlapped_areas == 0)
+    if len(candidates) == 0:
+        raise ValueError("No non-overlapping claim found")
+
+    return claims[candidates[0]]
+
+
 def count_position_overlap(claims: list[Claim]) -> dict[Position, int]:
     """Count the number of claims that overlap at each position."""
 
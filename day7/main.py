@@ -5,7 +5,8 @@ https://adventofcode.com/2018/day/7
 """
 
 import re
-from heapq import heappop, heappush
+from dataclasses import dataclass, field
+from heapq import heapify, heappop, heappush
 from os import path
 from pprint import pprint
 from typing import NamedTuple
@@ -115,6 +116,163 @@ def find_completion_order(instructions: list[Instruction]) -> list[str]:
     return completion_order
 
 
+@dataclass
+class IncrementalDependencyGraph:
+    """A graph of step dependencies that keeps its completion order up to date.
+
+    The completion order is the same one found by `find_completion_order`, but
+    it is repaired in place as dependencies are added rather than recomputed.
+    """
+
+    dependencies: dict[str, set[str]] = field(default_factory=dict)
+    dependents: dict[str, set[str]] = field(default_factory=dict)
+    order: list[str] = field(default_factory=list)
+    positions: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_instructions(
+        cls,
+        instructions: list[Instruction],
+    ) -> "IncrementalDependencyGraph":
+        """Create a graph by adding instructions one at a time."""
+
+        graph = cls()
+
+        for step, dependency in instructions:
+            graph.add_dependency(step, dependency)
+
+        return graph
+
+    def add_step(self, step: str) -> None:
+        """Add a step without any dependencies."""
+
+        if step in self.positions:
+            return
+
+        self.dependencies[step] = set()
+        self.dependents[step] = set()
+
+        # NOTE: A step without dependencies is available from the start, so it
+        # is chosen as soon as the step that would be chosen otherwise comes
+        # later alphabetically. Since it unblocks nothing, the rest follows.
+        index = 0
+        while index < len(self.order) and self.order[index] < step:
+            index += 1
+
+        self.order.insert(index, step)
+        self.update_positions(index)
+
+    def add_dependency(self, step: str, dependency: str) -> None:
+        """Add a dependency between two steps and repair the completion order.
+
+        Raises a ValueError if the dependency would create a cycle.
+        """
+
+        # NOTE: The dependency is checked before either step is added, so that
+        # a rejected dependency leaves the graph unchanged.
+        if self.would_create_cycle(step, dependency):
+            raise ValueError(
+                f"Step {step} cannot depend on step {dependency} as it would "
+                "create a cycle.",
+            )
+
+        self.add_step(step)
+        self.add_step(dependency)
+
+        if dependency in self.dependencies[step]:
+            return
+
+        step_position = self.positions[step]
+        dependency_position = self.positions[dependency]
+
+        self.dependencies[step].add(dependency)
+        self.dependents[dependency].add(step)
+
+        # NOTE: When the dependency is already completed first, the order does
+        # not change. Otherwise, every step ahead of the dependent step is
+        # still chosen the same way, so only the rest of the order is redone.
+        if dependency_position > step_position:
+            self.reorder_from(step_position)
+
+    def would_create_cycle(self, step: str, dependency: str) -> bool:
+        """Determine whether making a step depend on another would create a cycle."""
+
+        if step == dependency:
+            return True
+
+        if step not in self.positions or dependency not in self.positions:
+            return False
+
+        dependency_position = self.positions[dependency]
+
+        return dependency_position >= self.positions[step] and self.is_reachable(
+            step,
+            dependency,
+            dependency_position,
+        )
+
+    def is_reachable(self, source: str, target: str, limit: int) -> bool:
+        """Determine whether a step depends, directly or not, on another step.
+
+        Only steps positioned no later than the limit are searched, since the
+        current order rules out paths through any later step.
+        """
+
+        visited = {source}
+        pending = [source]
+
+        while pending:
+            current_step = pending.pop()
+            if current_step == target:
+                return True
+
+            for dependent in self.dependents[current_step]:
+                if dependent in visited or self.positions[dependent] > limit:
+                    continue
+
+                visited.add(dependent)
+                pending.append(dependent)
+
+        return False
+
+    def reorder_from(self, start: int) -> None:
+        """Redo the completion order from a position onward."""
+
+        remaining_steps = self.order[start:]
+        remaining_dependency_counts = {
+            step: sum(
+                self.positions[dependency] >= start
+                for dependency in self.dependencies[step]
+            )
+            for step in remaining_steps
+        }
+
+        next_steps = [
+            step for step, count in remaining_dependency_counts.items() if count == 0
+        ]
+        heapify(next_steps)
+
+        index = start
+        while next_steps:
+            current_step = heappop(next_steps)
+            self.order[index] = current_step
+            index += 1
+
+            for dependent in self.dependents[current_step]:
+                remaining_dependency_counts[dependent] -= 1
+
+                if remaining_dependency_counts[dependent] == 0:
+                    heappush(next_steps, dependent)
+
+        self.update_positions(start)
+
+    def update_positions(self, start: int) -> None:
+        """Record the positions of steps from a position onward."""
+
+        for index in range(start, len(self.order)):
+            self.positions[self.order[index]] = index
+
+
 def get_step_completion_time(
     step: str,
     base_completion_time: int = BASE_STEP_COMPLETION_TIME,
@@ -203,7 +361,7 @@ def main() -> None:
     pprint(instructions)
 
     completion_order = find_completion_order(instructions)
-    print(f"The correct completion order is {"".join(completion_order)}")
+    print(f"The correct completion order is {''.join(completion_order)}")
 
     total_completion_time = get_total_completion_time(instructions)
     print(f"The total completion time is {total_completion_time}")